@@ -0,0 +1,36 @@
+"""
+Response compression middleware for IVEP backend.
+Gzips JSON and other buffered responses; Server-Sent Events are left untouched.
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+
+class _SSEAwareGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await super().send_with_gzip(message)
+            # The gzip stream only flushes on close, which would hold SSE frames
+            # until the end; treat event streams as already encoded (passthrough).
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                self.content_encoding_set = True
+            return
+        await super().send_with_gzip(message)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware that never buffers text/event-stream responses."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = _SSEAwareGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
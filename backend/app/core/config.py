@@ -3,16 +3,25 @@ Configuration module for IVEP backend.
 Loads environment variables and provides application settings.
 """
 
-from functools import lru_cache
-from typing import Literal
+import os
+from typing import Literal, Optional
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
+ENV_FILE = ".env"
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables.
+
+    Every field is a plain env/.env value. get_settings() hands .env to
+    pydantic per build, so the file's secrets never enter os.environ (and
+    subprocesses do not inherit them); real environment variables win.
+    If a field ever moves to a remote secret store, resolve it lazily
+    (e.g. a cached_property) rather than in __init__.
     """
 
     # App Settings
@@ -21,6 +30,13 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     API_V1_STR: str = "/api/v1"
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]  # Override in production
+    # Assistant, translation, transcripts and recommendations routers (heavy ML imports)
+    ENABLE_AI_ROUTERS: bool = True
+    # Assistant vector index: "chroma" (HNSW) or "faiss" (flat, then IVF-PQ past 10k chunks).
+    # Backends keep separate storage: after switching, re-ingest the knowledge base.
+    VECTOR_BACKEND: str = "chroma"
+    # Translation pairs loaded at startup, e.g. "en-fr,fr-en,en-ar,ar-en" (empty: load on first use)
+    TRANSLATION_WARMUP_PAIRS: str = ""
 
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
@@ -46,6 +62,10 @@ class Settings(BaseSettings):
     # MongoDB
     MONGO_URI: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "ivep_db"
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_COMPRESSORS: str = "zstd,zlib"  # wire compression, in order of preference
+    MONGO_ATLAS_SEARCH: bool = False  # assistant fact lookups use Atlas $search ("default" index)
 
     # Stripe Payment Gateway
     STRIPE_SECRET_KEY: str = ""
@@ -64,9 +84,8 @@ class Settings(BaseSettings):
     R2_PUBLIC_BASE_URL: str = ""
 
     # Pydantic Config
+    # .env is passed per build by get_settings(); undeclared keys are ignored
     class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
         case_sensitive = True
         extra = "ignore"
     
@@ -103,13 +122,45 @@ class Settings(BaseSettings):
             self.DEBUG = True  # Always debug in dev
 
 
-@lru_cache
+# (.env mtime, instance) for the current Settings
+_settings_cache: Optional[tuple[Optional[float], Settings]] = None
+
+
+def _env_file_mtime() -> Optional[float]:
+    try:
+        return os.stat(ENV_FILE).st_mtime
+    except OSError:
+        return None
+
+
 def get_settings() -> Settings:
     """
     Return a cached Settings instance.
-    """
-    return Settings()
 
+    .env is parsed only when Settings is (re)built. In dev the file's mtime is
+    checked on each call and Settings is rebuilt when it changed, since
+    ``uvicorn --reload`` only restarts on .py changes; other environments
+    never look at the file again.
+    """
+    global _settings_cache
+    cached = _settings_cache
+    if cached is not None and cached[1].ENV != "dev":
+        return cached[1]
+    mtime = _env_file_mtime()
+    if cached is not None and mtime == cached[0]:
+        return cached[1]
+    instance = Settings(_env_file=ENV_FILE, _env_file_encoding="utf-8")
+    _settings_cache = (mtime, instance)
+    return instance
+
+
+def __getattr__(name: str):
+    """
+    Resolve ``settings`` lazily so importing this module does not build Settings.
 
-# Optional direct instance (if you prefer importing settings directly)
-settings = get_settings()
\ No newline at end of file
+    ``from app.core.config import settings`` keeps working and returns the
+    cached get_settings() instance on first access.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,42 +1,42 @@
-from fastapi import Depends
-# Optional get_current_user for routes that allow unauthenticated access
-from typing import Optional
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-
-async def optional_get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-) -> Optional[dict]:
-    if not credentials:
-        return None
-    try:
-        return await verify_jwt_token(credentials.credentials)
-    except Exception:
-        return None
 """
 Dependency injection module for IVEP backend.
 Provides authentication and authorization dependencies for FastAPI routes.
 """
 
+from functools import lru_cache
 from typing import Callable, Optional
 from fastapi import Depends, HTTPException, status, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from pydantic import ValidationError
 
-from app.core.config import settings
-from app.core.security import verify_token_type
-from app.modules.users.service import get_user_by_id
+from app.core.security import decode_token
+from app.modules.users.service import get_user_by_id_cached
 from app.modules.auth.enums import Role
-from app.modules.subscriptions.schemas import PLAN_FEATURES
+from app.modules.subscriptions.schemas import get_plan_feature
 from app.modules.subscriptions.service import get_plan
-from app.modules.events.service import list_events
-from app.db.mongo import get_database
+from app.modules.events.service import count_events
+from app.modules.organizations.service import get_organization_id_by_owner
 
 
 # Security scheme
 security = HTTPBearer()
 _optional_bearer = HTTPBearer(auto_error=False)
 
+# Details of the auth path's 401 responses; a fresh HTTPException is raised
+# each time, since re-raising one instance keeps growing its __traceback__
+_BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+_INVALID_TOKEN_DETAIL = "Invalid or expired token"
+_INVALID_PAYLOAD_DETAIL = "Invalid token payload"
+_USER_NOT_FOUND_DETAIL = "User not found for token subject. Please sign in again."
+_USER_INACTIVE_DETAIL = "User is inactive"
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_BEARER_CHALLENGE,
+    )
+
 
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(_optional_bearer),
@@ -50,12 +50,28 @@ async def get_optional_user(
         return None
 
 
+# Optional get_current_user for routes that allow unauthenticated access
+async def optional_get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_optional_bearer),
+) -> Optional[dict]:
+    if not credentials:
+        return None
+    try:
+        return await verify_jwt_token(credentials.credentials)
+    except Exception:
+        return None
+
+
 # Get current authenticated user
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
     """
     Get the current authenticated user from JWT token.
+
+    Every guard below depends on this exact callable (never a wrapper), so
+    FastAPI's per-request dependency cache verifies the token only once even
+    when several guards are stacked on one route.
     """
 
     token = credentials.credentials
@@ -77,42 +93,21 @@ async def verify_jwt_token(token: str) -> dict:
     """
     Verify JWT token and return user.
     """
-    # First try advanced token verification (new architecture)
-    payload = verify_token_type(token, "access")
-
-    # Fallback to direct JWT decode (legacy support)
-    if payload is None:
-        try:
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM],
-            )
-        except (JWTError, ValidationError):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    # Single decode; tokens issued before the "type" claim existed count as access tokens
+    payload = decode_token(token)
+    if payload is None or payload.get("type", "access") != "access":
+        raise _unauthorized(_INVALID_TOKEN_DETAIL)
 
     # Extract user ID
     user_id = payload.get("sub")
     if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized(_INVALID_PAYLOAD_DETAIL)
 
-    # Try MongoDB-backed user service
-    user = await get_user_by_id(user_id)
+    # MongoDB-backed user service (short TTL cache in front)
+    user = await get_user_by_id_cached(user_id)
 
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found for token subject. Please sign in again.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized(_USER_NOT_FOUND_DETAIL)
 
     # Normalize role if coming from Mongo
     if isinstance(user.get("role"), str):
@@ -128,26 +123,26 @@ async def verify_jwt_token(token: str) -> dict:
         user["id"] = user["_id"]
 
     if not user.get("is_active", False):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User is inactive",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized(_USER_INACTIVE_DETAIL)
 
     return user
 
 
 # Role-based authorization
+@lru_cache(maxsize=None)
 def require_role(role: Role) -> Callable:
     """
     Dependency factory that requires a specific role.
+
+    Cached per role so every route guarded by the same role shares one checker.
     """
+    denied_detail = f"Access denied. Required role: {role.value}"
 
     async def role_checker(current_user: dict = Depends(get_current_user)) -> dict:
         if current_user["role"] != role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required role: {role.value}",
+                detail=denied_detail,
             )
         return current_user
 
@@ -158,13 +153,19 @@ def require_roles(roles: list[Role]) -> Callable:
     """
     Dependency factory that requires one of the specified roles.
     """
+    return _roles_checker(tuple(roles))
+
+
+@lru_cache(maxsize=None)
+def _roles_checker(roles: tuple[Role, ...]) -> Callable:
+    allowed = frozenset(roles)
+    denied_detail = f"Access denied. Required roles: {[r.value for r in roles]}"
 
     async def roles_checker(current_user: dict = Depends(get_current_user)) -> dict:
-        if current_user["role"] not in roles:
-            role_names = [r.value for r in roles]
+        if current_user["role"] not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {role_names}",
+                detail=denied_detail,
             )
         return current_user
 
@@ -182,34 +183,27 @@ def require_feature(feature_name: str) -> Callable:
         if current_user["role"] != Role.ORGANIZER:
             return current_user
 
-        # Find organization owned by user from live MongoDB data
-        from app.modules.organizations.service import list_organizations
+        # Find organization owned by user (indexed owner_id lookup)
         org_id = None
         try:
-            orgs = await list_organizations()
-            for org in orgs:
-                if str(org.get("owner_id")) == str(current_user.get("_id")):
-                    org_id = org.get("_id")
-                    break
+            org_id = await get_organization_id_by_owner(current_user.get("_id"))
         except Exception:
             pass
 
         if not org_id:
             return current_user
 
-        # Get plan & features
+        # Get plan
         plan = get_plan(org_id)
-        features = PLAN_FEATURES.get(plan, {})
 
         # Numeric limit feature (example: max_events)
         if feature_name == "max_events":
-            limit = features.get("max_events", 1)
+            limit = get_plan_feature(plan, "max_events", 1)
 
             if limit == -1:  # unlimited
                 return current_user
 
-            events = await list_events(organizer_id=current_user.get("_id"))
-            if len(events) >= limit:
+            if await count_events(current_user.get("_id"), limit=limit) >= limit:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Feature limit reached: {feature_name}. Upgrade your plan.",
@@ -217,7 +211,7 @@ def require_feature(feature_name: str) -> Callable:
             return current_user
 
         # Boolean feature check
-        if not features.get(feature_name, False):
+        if not get_plan_feature(plan, feature_name):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Feature access denied: {feature_name}. Upgrade your plan.",
@@ -3,24 +3,40 @@ Security module for IVEP backend.
 Provides password hashing, JWT token creation and validation.
 """
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, Union
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 
 from app.core.config import get_settings
 
+try:  # optional speedup for the token fast path
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
-# Password hashing (passlib bcrypt)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+# Password hashing: argon2id for new hashes, bcrypt kept so legacy hashes still verify.
+# Both libraries are called directly (no passlib scheme dispatch).
+_argon2 = PasswordHasher()
 
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a plain text password using bcrypt via passlib.
+    Hash a plain text password using argon2id.
     """
-    return pwd_context.hash(password)
+    return _argon2.hash(password)
 
 
 def hash_password(password: str) -> str:
@@ -30,11 +46,54 @@ def hash_password(password: str) -> str:
     return get_password_hash(password)
 
 
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_BCRYPT_HASH_LENGTH = 60
+
+
+def _is_supported_hash(hashed_password: str) -> bool:
+    """
+    Cheap shape check so malformed hashes never reach the KDF.
+
+    Hashes of an unknown scheme are simply a failed verification.
+    """
+    if not isinstance(hashed_password, str):
+        return False
+    if hashed_password.startswith("$argon2"):
+        return True
+    return hashed_password.startswith(_BCRYPT_PREFIXES) and len(hashed_password) == _BCRYPT_HASH_LENGTH
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain text password against a hashed password.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if not _is_supported_hash(hashed_password):
+        return False
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _argon2.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in a worker thread so the event loop keeps serving requests.
+    """
+    return await asyncio.to_thread(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in a worker thread so the event loop keeps serving requests.
+    """
+    if not _is_supported_hash(hashed_password):
+        return False
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
 
 
 # JWT helpers
@@ -54,6 +113,40 @@ def _jwt_secret_and_algorithm() -> tuple[str, str]:
     return secret, algo
 
 
+class _JwtConfig(NamedTuple):
+    key: Key
+    algorithm: str
+    algorithms: tuple[str, ...]
+    hmac_secret: Optional[bytes]  # set for HS256, enables the inline verifier
+
+
+# (settings instance, prebuilt config)
+_jwt_cfg: Optional[tuple[Any, _JwtConfig]] = None
+
+
+def _jwt_config() -> _JwtConfig:
+    """
+    Return the prebuilt JWT signing key and algorithm parameters.
+
+    The jose key object is constructed once per Settings instance so encode and
+    decode skip key parsing and settings lookups on every call.
+    """
+    global _jwt_cfg
+    s = get_settings()
+    cached = _jwt_cfg
+    if cached is None or cached[0] is not s:
+        secret, algo = _jwt_secret_and_algorithm()
+        cfg = _JwtConfig(
+            key=jwk.construct(secret, algo),
+            algorithm=algo,
+            algorithms=(algo,),
+            hmac_secret=secret.encode("utf-8") if algo == "HS256" else None,
+        )
+        cached = (s, cfg)
+        _jwt_cfg = cached
+    return cached[1]
+
+
 def create_access_token(
     subject: Union[str, Any] = None,
     expires_delta: Optional[timedelta] = None,
@@ -66,7 +159,7 @@ def create_access_token(
     1) Legacy: create_access_token(subject="user-id")
     2) New:    create_access_token(data={"sub": "...", "role": "..."})
     """
-    secret, algo = _jwt_secret_and_algorithm()
+    cfg = _jwt_config()
     to_encode = data.copy() if data is not None else {}
     
     # If subject is provided separately, ensure it goes into 'sub'
@@ -74,7 +167,6 @@ def create_access_token(
         to_encode["sub"] = str(subject)
 
     s = get_settings()
-    # secret, algo = _jwt_secret_and_algorithm()
 
     # # Build payload
     # if data is not None:
@@ -91,7 +183,7 @@ def create_access_token(
         )
 
     to_encode.update({"exp": expire, "type": "access"})
-    return jwt.encode(to_encode, secret, algorithm=algo)
+    return jwt.encode(to_encode, cfg.key, algorithm=cfg.algorithm)
 
 
 def create_refresh_token(
@@ -102,7 +194,7 @@ def create_refresh_token(
     Create a JWT refresh token.
     """
     s = get_settings()
-    secret, algo = _jwt_secret_and_algorithm()
+    cfg = _jwt_config()
 
     to_encode = data.copy()
 
@@ -114,18 +206,85 @@ def create_refresh_token(
         )
 
     to_encode.update({"exp": expire, "type": "refresh"})
-    return jwt.encode(to_encode, secret, algorithm=algo)
+    return jwt.encode(to_encode, cfg.key, algorithm=cfg.algorithm)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _verify_hs256(token: str, secret: bytes) -> Optional[dict[str, Any]]:
+    """
+    Minimal HS256 verifier: checks header, signature and time claims.
+
+    Mirrors the checks jose.jwt.decode performs for our tokens without its
+    intermediate objects. Returns None for anything it does not accept.
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = _json_loads(_b64url_decode(header_b64))
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            return None
+        expected = hmac.new(secret, f"{header_b64}.{payload_b64}".encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature_b64)):
+            return None
+        payload = _json_loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError, UnicodeError):
+        return None
+
+    if not isinstance(payload, dict) or "aud" in payload:
+        return None
+    now = time.time()
+    for claim in ("exp", "nbf", "iat"):
+        value = payload.get(claim)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            return None
+    if payload.get("exp") is not None and payload["exp"] <= now:
+        return None
+    if payload.get("nbf") is not None and payload["nbf"] > now:
+        return None
+    return payload
+
+
+@lru_cache(maxsize=4096)
+def _decode_token_cached(token: str, cfg: _JwtConfig) -> tuple[Optional[dict[str, Any]], float]:
+    """
+    Decode a JWT once and remember the result as (payload, exp_timestamp).
+
+    Invalid tokens are cached as (None, 0.0) so repeated bad tokens are also cheap.
+    """
+    if cfg.hmac_secret is not None:
+        payload = _verify_hs256(token, cfg.hmac_secret)
+    else:
+        try:
+            payload = jwt.decode(token, cfg.key, algorithms=cfg.algorithms)
+        except JWTError:
+            payload = None
+    if payload is None:
+        return None, 0.0
+    exp = payload.get("exp")
+    return payload, float(exp) if exp is not None else float("inf")
+
+
+def clear_token_cache() -> None:
+    """
+    Drop all cached token payloads (e.g. on logout or secret rotation).
+    """
+    _decode_token_cached.cache_clear()
 
 
 def decode_token(token: str) -> Optional[dict[str, Any]]:
     """
     Decode and validate a JWT token. Returns payload or None if invalid.
+
+    Payloads are cached per token; the cached expiry is re-checked on every
+    call so expired tokens are rejected without decoding them again.
     """
-    secret, algo = _jwt_secret_and_algorithm()
-    try:
-        return jwt.decode(token, secret, algorithms=[algo])
-    except JWTError:
+    payload, exp_ts = _decode_token_cached(token, _jwt_config())
+    if payload is None or exp_ts <= time.time():
         return None
+    # Hand out a copy so callers cannot mutate the cached payload.
+    return dict(payload)
 
 
 def verify_token_type(token: str, expected_type: str) -> Optional[dict[str, Any]]:
@@ -7,17 +7,25 @@ Provides fake data for development and testing.
 from datetime import datetime, timezone
 from uuid import UUID
 
+from app.core.config import get_settings
 from app.core.security import hash_password
 from app.modules.auth.enums import Role
 
 
+# Seed passwords, hashed on first lookup (see _with_hash) rather than at import
+_SEED_PASSWORDS: dict[str, str] = {
+    "admin@ivep.com": "admin123",
+    "organizer@ivep.com": "organizer123",
+    "visitor@ivep.com": "visitor123",
+}
+
+
 # In-memory user store
 FAKE_USERS: dict[str, dict] = {
     "admin@ivep.com": {
         "id": UUID("11111111-1111-1111-1111-111111111111"),
         "email": "admin@ivep.com",
         "full_name": "Admin User",
-        "hashed_password": hash_password("admin123"),
         "role": Role.ADMIN,
         "is_active": True,
         "created_at": datetime.now(timezone.utc),
@@ -26,7 +34,6 @@ FAKE_USERS: dict[str, dict] = {
         "id": UUID("22222222-2222-2222-2222-222222222222"),
         "email": "organizer@ivep.com",
         "full_name": "Organizer User",
-        "hashed_password": hash_password("organizer123"),
         "role": Role.ORGANIZER,
         "is_active": True,
         "created_at": datetime.now(timezone.utc),
@@ -35,13 +42,15 @@ FAKE_USERS: dict[str, dict] = {
         "id": UUID("33333333-3333-3333-3333-333333333333"),
         "email": "visitor@ivep.com",
         "full_name": "Visitor User",
-        "hashed_password": hash_password("visitor123"),
         "role": Role.VISITOR,
         "is_active": True,
         "created_at": datetime.now(timezone.utc),
     },
 }
 
+# Secondary index over FAKE_USERS; kept in sync by create_user()
+FAKE_USERS_BY_ID: dict[UUID, dict] = {u["id"]: u for u in FAKE_USERS.values()}
+
 
 # In-memory organization store
 FAKE_ORGANIZATIONS: dict[UUID, dict] = {}
@@ -50,20 +59,52 @@ FAKE_ORGANIZATIONS: dict[UUID, dict] = {}
 # In-memory organization members store
 FAKE_ORG_MEMBERS: list[dict] = []
 
+# Whether the seed accounts were checked against ENV (done on first use, not at import)
+_seeds_checked = False
+
+
+def _check_seeds() -> None:
+    """Drop the seed accounts outside dev; they are for local development only."""
+    global _seeds_checked
+    if _seeds_checked:
+        return
+    _seeds_checked = True
+    if get_settings().ENV != "dev":
+        for email in list(_SEED_PASSWORDS):
+            seed = FAKE_USERS.pop(email, None)
+            if seed is not None:
+                FAKE_USERS_BY_ID.pop(seed["id"], None)
+        _SEED_PASSWORDS.clear()
+
+
+def _with_hash(user: dict | None) -> dict | None:
+    """Hash a seed user's password the first time the user is looked up."""
+    if user is not None and "hashed_password" not in user:
+        plain = _SEED_PASSWORDS.pop(user["email"], None)
+        if plain is not None:
+            user["hashed_password"] = hash_password(plain)
+    return user
+
 
 def get_user_by_email(email: str) -> dict | None:
     """Get user by email from in-memory store."""
-    return FAKE_USERS.get(email)
+    _check_seeds()
+    return _with_hash(FAKE_USERS.get(email))
 
 
 def get_user_by_id(user_id: UUID) -> dict | None:
     """Get user by ID from in-memory store."""
-    for user in FAKE_USERS.values():
-        if user["id"] == user_id:
-            return user
-    return None
+    _check_seeds()
+    return _with_hash(FAKE_USERS_BY_ID.get(user_id))
+
+
 def create_user(user_data: dict) -> dict:
     """Create a new user in the in-memory store."""
+    _check_seeds()
     email = user_data["email"]
+    previous = FAKE_USERS.get(email)
+    if previous is not None:
+        FAKE_USERS_BY_ID.pop(previous["id"], None)
     FAKE_USERS[email] = user_data
+    FAKE_USERS_BY_ID[user_data["id"]] = user_data
     return user_data
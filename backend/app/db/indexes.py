@@ -1,270 +1,260 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 from .mongo import get_database
 
+logger = logging.getLogger(__name__)
 
-async def ensure_indexes() -> None:
-    db: AsyncIOMotorDatabase = get_database()
-    if db is None:
-        return
+_SLUG_UNIQUE = {"unique": True, "partialFilterExpression": {"slug": {"$exists": True}}}
 
+# (collection, keys, options) — one createIndexes command per collection, see ensure_indexes()
+INDEX_SPECS: list[tuple[str, object, dict]] = [
     # Users (fallback store)
-    try:
-        await db.users.create_index("email", unique=True)
-        await db.users.create_index("role")
-        await db.users.create_index("is_active")
-    except Exception:
-        pass
+    ("users", "email", {"unique": True}),
+    # Admin registration lists filter by role and sort newest first
+    ("users", [("role", 1), ("created_at", -1)], {}),
 
     # Organizations
-    try:
-        await db.organizations.create_index("owner_id")
-        await db.organizations.create_index("created_at")
-        try:
-            await db.organizations.create_index(
-                "slug",
-                unique=True,
-                partialFilterExpression={"slug": {"$exists": True}},
-            )
-        except Exception:
-            pass
-    except Exception:
-        pass
+    ("organizations", "owner_id", {}),
+    ("organizations", "created_at", {}),
+    ("organizations", "slug", _SLUG_UNIQUE),
 
     # Events
-    try:
-        await db.events.create_index("organizer_id")
-        await db.events.create_index("state")
-        await db.events.create_index("created_at")
-        await db.events.create_index([("title", "text")])
-        try:
-            await db.events.create_index(
-                "slug",
-                unique=True,
-                partialFilterExpression={"slug": {"$exists": True}},
-            )
-        except Exception:
-            pass
-    except Exception:
-        pass
+    ("events", "organizer_id", {}),
+    ("events", "state", {}),
+    ("events", "created_at", {}),
+    ("events", "slug", _SLUG_UNIQUE),
+    # Assistant fact lookups ($text on title; legacy string ids)
+    ("events", [("title", "text")], {}),
+    ("events", "id", {"sparse": True}),
 
     # Participants
-    try:
-        await db.participants.create_index([("event_id", 1), ("user_id", 1)], unique=True)
-        await db.participants.create_index("status")
-    except Exception:
-        pass
+    ("participants", [("event_id", 1), ("user_id", 1)], {"unique": True}),
+    ("participants", "status", {}),
 
     # Stands
-    try:
-        await db.stands.create_index([("event_id", 1), ("organization_id", 1)], unique=True)
-        await db.stands.create_index("name")
-        try:
-            await db.stands.create_index(
-                "slug",
-                unique=True,
-                partialFilterExpression={"slug": {"$exists": True}},
-            )
-        except Exception:
-            pass
-    except Exception:
-        pass
+    ("stands", [("event_id", 1), ("organization_id", 1)], {"unique": True}),
+    ("stands", "name", {}),
+    ("stands", "slug", _SLUG_UNIQUE),
+    # Assistant fact lookups ($text on name; legacy string ids)
+    ("stands", [("name", "text")], {}),
+    ("stands", "id", {"sparse": True}),
 
     # Resources
-    try:
-        await db.resources.create_index("stand_id")
-        await db.resources.create_index("upload_date")
-        await db.resources.create_index("downloads")
-        await db.resources.create_index([("title", "text"), ("tags", "text")])
-    except Exception:
-        pass
+    ("resources", "stand_id", {}),
+    ("resources", "upload_date", {}),
+    ("resources", "downloads", {}),
 
     # Meetings
-    try:
-        await db.meetings.create_index("stand_id")
-        await db.meetings.create_index("visitor_id")
-        await db.meetings.create_index("status")
-        await db.meetings.create_index("start_time")
-    except Exception:
-        pass
+    ("meetings", "visitor_id", {}),
+    ("meetings", "status", {}),
+    ("meetings", "start_time", {}),
 
     # Leads
-    try:
-        await db.leads.create_index([("visitor_id", 1), ("stand_id", 1)], unique=True)
-        await db.leads.create_index("score")
-        await db.leads.create_index("last_interaction")
-        await db.leads.create_index([("stand_id", 1), ("created_at", 1)])
-    except Exception:
-        pass
+    ("leads", [("visitor_id", 1), ("stand_id", 1)], {"unique": True}),
+    ("leads", "score", {}),
+    ("leads", "last_interaction", {}),
+    ("leads", [("stand_id", 1), ("created_at", 1)], {}),
+    # Event analytics lead count
+    ("leads", "event_id", {}),
 
     # Lead Interactions
-    try:
-        await db.lead_interactions.create_index("stand_id")
-        await db.lead_interactions.create_index("visitor_id")
-        await db.lead_interactions.create_index("timestamp")
-    except Exception:
-        pass
+    ("lead_interactions", "stand_id", {}),
+    ("lead_interactions", "visitor_id", {}),
+    ("lead_interactions", "timestamp", {}),
 
     # Chat Rooms / Messages
-    try:
-        await db.chat_rooms.create_index("members")
-        await db.chat_rooms.create_index("created_at")
-        await db.chat_messages.create_index("room_id")
-        await db.chat_messages.create_index("timestamp")
-    except Exception:
-        pass
+    ("chat_rooms", "members", {}),
+    ("chat_rooms", "created_at", {}),
+    ("chat_rooms", "event_id", {}),
+    ("chat_messages", "timestamp", {}),
 
     # Notifications
-    try:
-        await db.notifications.create_index("user_id")
-        await db.notifications.create_index("created_at")
-        await db.notifications.create_index("type")
-    except Exception:
-        pass
+    ("notifications", "user_id", {}),
+    ("notifications", "created_at", {}),
+    ("notifications", "type", {}),
 
     # Subscriptions
-    try:
-        await db.subscriptions.create_index("organization_id", unique=True)
-        await db.subscriptions.create_index("plan")
-    except Exception:
-        pass
+    ("subscriptions", "organization_id", {"unique": True}),
+    ("subscriptions", "plan", {}),
 
     # Assistant (RAG)
-    try:
-        await db.assistant_sessions.create_index("scope")
-        await db.assistant_sessions.create_index("user_id")
-        await db.assistant_messages.create_index("session_id")
-        await db.assistant_messages.create_index("timestamp")
-    except Exception:
-        pass
+    ("assistant_sessions", "scope", {}),
+    ("assistant_sessions", "user_id", {}),
+    ("assistant_messages", "session_id", {}),
+    ("assistant_messages", "timestamp", {}),
 
     # Analytics events
-    try:
-        await db.analytics_events.create_index("event_id")
-        await db.analytics_events.create_index("stand_id")
-        await db.analytics_events.create_index("user_id")
-        await db.analytics_events.create_index("type")
-        await db.analytics_events.create_index("timestamp")
-        # Compound for stand-level performance
-        await db.analytics_events.create_index([("stand_id", 1), ("type", 1), ("created_at", 1)])
-        # Compound for live-metrics download query
-        await db.analytics_events.create_index([("event_id", 1), ("type", 1), ("timestamp", 1)])
-    except Exception:
-        pass
+    ("analytics_events", "user_id", {}),
+    ("analytics_events", "type", {}),
+    ("analytics_events", "timestamp", {}),
+    # Compound for stand-level performance
+    ("analytics_events", [("stand_id", 1), ("type", 1), ("created_at", 1)], {}),
+    # Compound for live-metrics download query
+    ("analytics_events", [("event_id", 1), ("type", 1), ("timestamp", 1)], {}),
+    # Compound for the event analytics 14-day trend
+    ("analytics_events", [("event_id", 1), ("created_at", -1)], {}),
 
     # Chat messages — compound for messages-per-minute query
-    try:
-        await db.chat_messages.create_index([("event_id", 1), ("timestamp", 1)])
-        await db.chat_messages.create_index([("room_id", 1), ("timestamp", 1)])
-    except Exception:
-        pass
+    ("chat_messages", [("event_id", 1), ("timestamp", 1)], {}),
+    ("chat_messages", [("room_id", 1), ("timestamp", 1)], {}),
 
     # Meetings — compound for ongoing meetings query
-    try:
-        await db.meetings.create_index([("stand_id", 1), ("status", 1), ("start_time", 1), ("end_time", 1)])
-    except Exception:
-        pass
+    ("meetings", [("stand_id", 1), ("status", 1), ("start_time", 1), ("end_time", 1)], {}),
 
     # Content flags
-    try:
-        await db.content_flags.create_index("entity_id")
-        await db.content_flags.create_index("entity_type")
-        await db.content_flags.create_index("created_at")
-        await db.content_flags.create_index([("entity_id", 1), ("resolved", 1)])
-    except Exception:
-        pass
+    ("content_flags", "entity_type", {}),
+    ("content_flags", "created_at", {}),
+    ("content_flags", [("entity_id", 1), ("resolved", 1)], {}),
 
     # Event Sessions (Week 5)
-    try:
-        await db.event_sessions.create_index("event_id")
-        await db.event_sessions.create_index("status")
-        await db.event_sessions.create_index([("event_id", 1), ("start_time", 1)])
-        await db.event_sessions.create_index([("status", 1), ("start_time", 1)])
-        await db.event_sessions.create_index([("status", 1), ("end_time", 1)])
-    except Exception:
-        pass
+    ("event_sessions", [("event_id", 1), ("start_time", 1)], {}),
+    ("event_sessions", [("status", 1), ("start_time", 1)], {}),
+    ("event_sessions", [("status", 1), ("end_time", 1)], {}),
 
     # Organizer Report (Week 6)
-    try:
-        await db.content_flags.create_index([("event_id", 1), ("status", 1)])
-        await db.stands.create_index("event_id")
-        await db.participants.create_index([("event_id", 1), ("role", 1), ("status", 1)])
-        await db.meetings.create_index([("stand_id", 1), ("status", 1)])
-        await db.leads.create_index([("stand_id", 1), ("last_interaction", 1)])
-    except Exception:
-        pass
+    ("content_flags", [("event_id", 1), ("status", 1)], {}),
+    ("participants", [("event_id", 1), ("role", 1), ("status", 1)], {}),
+    ("leads", [("stand_id", 1), ("last_interaction", 1)], {}),
 
     # Event Payments (visitor proof-based payments)
-    try:
-        await db.event_payments.create_index("event_id")
-        await db.event_payments.create_index("user_id")
-        await db.event_payments.create_index("status")
-        await db.event_payments.create_index([("event_id", 1), ("user_id", 1)])
-    except Exception:
-        pass
+    ("event_payments", "user_id", {}),
+    ("event_payments", "status", {}),
+    ("event_payments", [("event_id", 1), ("user_id", 1)], {}),
 
     # Enterprise Module (Week 7)
-    try:
-        # Products
-        await db.products.create_index("enterprise_id")
-        await db.products.create_index("organization_id")
-        await db.products.create_index("is_active")
-        await db.products.create_index([("name", "text"), ("description", "text"), ("tags", "text")])
-        
-        # Product Requests
-        await db.product_requests.create_index("enterprise_id")
-        await db.product_requests.create_index("visitor_id")
-        await db.product_requests.create_index("product_id")
-        await db.product_requests.create_index("status")
-        await db.product_requests.create_index("created_at")
-
-        # Organizations - extra fields
-        await db.organizations.create_index("type")
-        await db.organizations.create_index("industry")
-    except Exception:
-        pass
+    # Products
+    ("products", "enterprise_id", {}),
+    ("products", "organization_id", {}),
+    ("products", "is_active", {}),
+    # Product Requests
+    ("product_requests", "enterprise_id", {}),
+    ("product_requests", "visitor_id", {}),
+    ("product_requests", "product_id", {}),
+    ("product_requests", "status", {}),
+    ("product_requests", "created_at", {}),
+    # Organizations - extra fields
+    ("organizations", "type", {}),
+    ("organizations", "industry", {}),
 
     # Stand Marketplace — products & orders (isolated from event payments)
-    try:
-        await db.stand_products.create_index("stand_id")
-        await db.stand_products.create_index("created_at")
-    except Exception:
-        pass
+    ("stand_products", "stand_id", {}),
+    ("stand_products", "created_at", {}),
+    ("stand_orders", "buyer_id", {}),
+    # Non-unique sparse index for fast lookup by session id
+    ("stand_orders", "stripe_session_id", {"sparse": True, "name": "stripe_session_id_sparse"}),
+    ("stand_orders", [("stand_id", 1), ("created_at", -1)], {}),
 
+    # Conferences & Meetings (video sessions)
+    # conferences
+    ("conferences", [("assigned_enterprise_id", 1), ("status", 1)], {}),
+    ("conferences", [("event_id", 1), ("status", 1)], {}),
+    ("conferences", [("start_time", 1), ("status", 1)], {}),
+    ("conferences", "livekit_room_name", {"sparse": True}),
+    # conference registrations
+    ("conference_registrations", [("conference_id", 1), ("user_id", 1)], {"unique": True}),
+    # conference Q&A
+    ("conference_qa", [("conference_id", 1), ("upvotes", -1)], {}),
+    # meetings — session fields
+    ("meetings", "session_status", {}),
+    ("meetings", "livekit_room_name", {"sparse": True}),
+]
+
+# Indexes that are obsolete or redundant; dropped before creation
+OBSOLETE_INDEXES: list[tuple[str, str]] = [
+    # Cart orders share a stripe_session_id, so these unique indexes must go
+    ("stand_orders", "stripe_session_id_1"),
+    ("stand_orders", "stripe_session_id_unique_sparse"),
+    # Text indexes no query uses ($regex search), so they only cost writes
+    ("resources", "title_text_tags_text"),
+    ("products", "name_text_description_text_tags_text"),
+    ("conferences", "title_text_description_text"),
+    # Superseded by users (role, created_at); nothing filters on is_active alone
+    ("users", "role_1"),
+    ("users", "is_active_1"),
+    # Redundant: each is a prefix of a compound index on the same collection
+    ("meetings", "stand_id_1"),
+    ("meetings", "stand_id_1_status_1"),
+    ("stands", "event_id_1"),
+    ("analytics_events", "event_id_1"),
+    ("analytics_events", "stand_id_1"),
+    ("chat_messages", "room_id_1"),
+    ("content_flags", "entity_id_1"),
+    ("event_sessions", "event_id_1"),
+    ("event_sessions", "status_1"),
+    ("event_payments", "event_id_1"),
+    ("conference_qa", "conference_id_1"),
+    ("stand_orders", "stand_id_1"),
+]
+
+# Fingerprint of the index set; stored in _meta so replicas skip no-op rebuilds
+INDEX_SPECS_HASH = hashlib.sha1(
+    json.dumps([INDEX_SPECS, OBSOLETE_INDEXES], sort_keys=True).encode()
+).hexdigest()
+
+
+async def _drop_obsolete_indexes(db: AsyncIOMotorDatabase) -> None:
+    for collection, name in OBSOLETE_INDEXES:
+        try:
+            await db[collection].drop_index(name)
+        except Exception:
+            pass
+
+
+async def _create_collection_indexes(
+    db: AsyncIOMotorDatabase, collection: str, specs: list[tuple[object, dict]]
+) -> bool:
+    """Create a collection's indexes in one command; on error retry one by one to isolate it."""
     try:
-        await db.stand_orders.create_index("stand_id")
-        await db.stand_orders.create_index("buyer_id")
-        # Drop old unique indexes — cart orders share a stripe_session_id
-        for old_name in ("stripe_session_id_1", "stripe_session_id_unique_sparse"):
-            try:
-                await db.stand_orders.drop_index(old_name)
-            except Exception:
-                pass
-        # Non-unique sparse index for fast lookup by session id
-        await db.stand_orders.create_index(
-            "stripe_session_id", sparse=True,
-            name="stripe_session_id_sparse",
+        await db[collection].create_indexes(
+            [IndexModel(keys, background=True, **options) for keys, options in specs]
         )
-        await db.stand_orders.create_index([("stand_id", 1), ("created_at", -1)])
+        return True
     except Exception:
         pass
 
-    # Conferences & Meetings (video sessions)
-    try:
-        # conferences
-        await db.conferences.create_index([("assigned_enterprise_id", 1), ("status", 1)])
-        await db.conferences.create_index([("event_id", 1), ("status", 1)])
-        await db.conferences.create_index([("start_time", 1), ("status", 1)])
-        await db.conferences.create_index("livekit_room_name", sparse=True)
-        await db.conferences.create_index([("title", "text"), ("description", "text")])
-        # conference registrations
-        await db.conference_registrations.create_index(
-            [("conference_id", 1), ("user_id", 1)], unique=True
+    ok = True
+    for keys, options in specs:
+        try:
+            await db[collection].create_index(keys, background=True, **options)
+        except Exception as e:
+            ok = False
+            logger.warning(f"Index creation failed on {collection} {keys}: {e}")
+    return ok
+
+
+async def ensure_indexes() -> None:
+    """
+    Create INDEX_SPECS unless _meta.indexes already records this exact set.
+    Delete that document to force a full rebuild.
+    """
+    db: AsyncIOMotorDatabase = get_database()
+    if db is None:
+        return
+
+    meta = await db["_meta"].find_one({"_id": "indexes"}, {"hash": 1})
+    if meta and meta.get("hash") == INDEX_SPECS_HASH:
+        return
+
+    await _drop_obsolete_indexes(db)
+
+    by_collection: dict[str, list[tuple[object, dict]]] = {}
+    for collection, keys, options in INDEX_SPECS:
+        by_collection.setdefault(collection, []).append((keys, options))
+
+    created = await asyncio.gather(
+        *(_create_collection_indexes(db, collection, specs) for collection, specs in by_collection.items())
+    )
+
+    # Only record the hash once every index exists, so failures are retried
+    if all(created):
+        await db["_meta"].update_one(
+            {"_id": "indexes"},
+            {"$set": {"hash": INDEX_SPECS_HASH, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
         )
-        # conference Q&A
-        await db.conference_qa.create_index("conference_id")
-        await db.conference_qa.create_index([("conference_id", 1), ("upvotes", -1)])
-        # meetings — session fields
-        await db.meetings.create_index("session_status")
-        await db.meetings.create_index("livekit_room_name", sparse=True)
-    except Exception:
-        pass
@@ -45,8 +45,6 @@ async def connect_to_mongo(max_retries: int = 3):
                     "connectTimeoutMS": 10000,             # 10 seconds for local
                     "socketTimeoutMS": None,
                     "retryWrites": True,
-                    "maxPoolSize": 50,
-                    "minPoolSize": 10,
                 }
             else:
                 connection_kwargs = {
@@ -54,10 +52,15 @@ async def connect_to_mongo(max_retries: int = 3):
                     "connectTimeoutMS": 15000,             # 15 seconds for cloud
                     "socketTimeoutMS": None,
                     "retryWrites": True,
-                    "maxPoolSize": 50,
-                    "minPoolSize": 10,
                 }
             
+            connection_kwargs.update(
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,  # opened in the background, so the first requests skip the handshake
+                maxIdleTimeMS=60000,
+                compressors=settings.MONGO_COMPRESSORS,  # unavailable codecs are skipped by pymongo
+            )
+
             db_client.client = AsyncIOMotorClient(mongo_uri, **connection_kwargs)
             
             # Test connection with timeout
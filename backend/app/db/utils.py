@@ -1,6 +1,12 @@
 from typing import Any
 from bson import ObjectId
 
+# Aggregation stage that stringifies _id and mirrors it to "id" server-side,
+# for pipelines whose documents hold no other ObjectId values.
+ID_AS_STRING_STAGE = {
+    "$addFields": {"_id": {"$toString": "$_id"}, "id": {"$toString": "$_id"}},
+}
+
 
 def _oid_or_value(value: Any) -> Any:
     """Return ObjectId if valid, else original value."""
@@ -8,28 +14,47 @@ def _oid_or_value(value: Any) -> Any:
         return value
     return ObjectId(value) if ObjectId.is_valid(value) else value
 
+# str(ObjectId) results, so ids repeated across rows share one string
+_OID_STR_CACHE_MAX_ENTRIES = 4096
+_oid_str_cache: dict[bytes, str] = {}
+
+
+def _oid_str(oid: ObjectId) -> str:
+    key = oid.binary
+    text = _oid_str_cache.get(key)
+    if text is None:
+        if len(_oid_str_cache) >= _OID_STR_CACHE_MAX_ENTRIES:
+            _oid_str_cache.clear()
+        text = _oid_str_cache[key] = str(oid)
+    return text
+
 
 def stringify_object_ids(obj: Any) -> Any:
     """
-    Recursively convert bson.ObjectId values to strings.
+    Convert bson.ObjectId values to strings, in place, at any depth.
     Also mirrors the value to an "id" field when the source key is "_id".
+    Returns the same object for convenience.
     """
-    if isinstance(obj, list):
-        return [stringify_object_ids(item) for item in obj]
-
-    if isinstance(obj, dict):
-        normalized = {}
-        for key, value in obj.items():
-            if key == "_id" and isinstance(value, ObjectId):
-                normalized[key] = str(value)
-            else:
-                normalized[key] = stringify_object_ids(value)
-        # Always set "id" mirror from "_id" (override any stale UUID-based "id")
-        if "_id" in normalized:
-            normalized["id"] = normalized["_id"]
-        return normalized
-
-    if isinstance(obj, ObjectId):
-        return str(obj)
+    if type(obj) is ObjectId:
+        return _oid_str(obj)
+
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if type(value) is ObjectId:
+                    node[key] = _oid_str(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+            # Always set "id" mirror from "_id" (override any stale UUID-based "id")
+            if "_id" in node:
+                node["id"] = node["_id"]
+        elif isinstance(node, list):
+            for index, item in enumerate(node):
+                if type(item) is ObjectId:
+                    node[index] = _oid_str(item)
+                elif isinstance(item, (dict, list)):
+                    stack.append(item)
 
     return obj
@@ -4,20 +4,26 @@ Main FastAPI application entry point for the Intelligent Virtual Exhibition Plat
 """
 
 import asyncio
+import importlib
 import logging
+import sys
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import APIRouter, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
-from app.core.config import get_settings
+from app.core.compression import CompressionMiddleware
+from app.core.config import Settings, get_settings
 from app.core.logging import setup_logging
 from app.core.ratelimit import RateLimitMiddleware
 from app.db.mongo import connect_to_mongo, close_mongo_connection, check_mongo_health
 from app.db.indexes import ensure_indexes
+from app.modules.analytics.pdf_pool import shutdown_pdf_pool
+from app.modules.audit.service import start_audit_writer, stop_audit_writer
+from app.modules.daily.service import close_client as close_daily_client
 from app.workers.lifecycle import lifecycle_loop
 
 # Routers (new architecture)
@@ -47,33 +53,25 @@ from app.modules.conferences.router import router as conferences_router
 
 # Routers (legacy/extra modules)
 from app.modules.chat.router import router as chat_router
-try:
-    from app.modules.ai_rag.router import router as rag_router
-except Exception:
-    rag_router = None
-
-try:
-    from app.modules.ai_translation.router import router as translation_router
-except Exception:
-    translation_router = None
-
-try:
-    from app.modules.transcripts.router import router as transcripts_router
-except Exception:
-    transcripts_router = None
 from app.modules.meetings.router import router as meetings_router
 from app.modules.resources.router import router as resources_router
 from app.modules.leads.router import router as leads_router
-try:
-    from app.modules.recommendations.router import router as recommendations_router
-except Exception:
-    recommendations_router = None
 from app.modules.favorites.router import router as favorites_router
 from app.modules.payments.router import router as payments_router
 from app.modules.marketplace.router import router as marketplace_router
 from app.modules.finance.router import router as finance_router
 
 
+def _log_index_task_result(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logging.getLogger(__name__).error(f"Index creation failed: {task.exception()!r}")
+
+
+def _log_warmup_result(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logging.getLogger(__name__).warning(f"{task.get_name()} failed: {task.exception()!r}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
@@ -82,7 +80,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Handles startup and shutdown events.
     """
     # Startup
-    settings = get_settings()
+    settings = app.state.settings
     setup_logging()
     logger = logging.getLogger(__name__)
 
@@ -92,7 +90,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Connect to MongoDB
     await connect_to_mongo()
-    await ensure_indexes()
+    # Build indexes in the background so the app starts serving immediately;
+    # /admin/health reports when this has finished.
+    app.state.index_task = asyncio.create_task(ensure_indexes())
+    app.state.index_task.add_done_callback(_log_index_task_result)
+    start_audit_writer()
+
+    # Warm the assistant's embedding model in the background when it is mounted
+    rag_vector_store = sys.modules.get("app.modules.ai_rag.vector_store")
+    if rag_vector_store is not None:
+        app.state.rag_warmup_task = asyncio.create_task(
+            asyncio.to_thread(rag_vector_store.warm_up), name="Assistant warm-up"
+        )
+        app.state.rag_warmup_task.add_done_callback(_log_warmup_result)
+
+    # Preload the hot translation pairs so their first request skips model loading
+    translation_model = sys.modules.get("app.modules.ai_translation.translation_model")
+    if translation_model is not None and settings.TRANSLATION_WARMUP_PAIRS:
+        pairs = [
+            tuple(pair.strip().split("-", 1))
+            for pair in settings.TRANSLATION_WARMUP_PAIRS.split(",")
+            if "-" in pair
+        ]
+        app.state.translation_warmup_task = asyncio.create_task(
+            asyncio.to_thread(translation_model.get_translator().warmup, pairs), name="Translation warm-up"
+        )
+        app.state.translation_warmup_task.add_done_callback(_log_warmup_result)
 
     # Start lifecycle background task
     _lifecycle_task = asyncio.create_task(lifecycle_loop())
@@ -102,71 +125,88 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     _lifecycle_task.cancel()
+    if not app.state.index_task.done():
+        app.state.index_task.cancel()
+    await close_daily_client()
+    await stop_audit_writer()
+    shutdown_pdf_pool()
+    if rag_vector_store is not None:
+        await rag_vector_store.stop_embedding_worker()
     await close_mongo_connection()
     logger.info(f"Shutting down {settings.APP_NAME}")
 
 
-def register_routers(app: FastAPI) -> None:
-    """
-    Register all application routers.
-    """
-    settings = get_settings()
-    api_prefix = getattr(settings, "API_V1_STR", "/api/v1")
-
+# (name, router, sub-prefix under API_V1_STR, tags). Optional AI/ML routers
+# are given as module paths and only imported when ENABLE_AI_ROUTERS is on,
+# since they pull in torch, transformers, whisper and sentence-transformers.
+ROUTERS: list[tuple[str, APIRouter | str, str, list[str] | None]] = [
     # New architecture routers
-    app.include_router(auth_router, prefix=api_prefix)
-    app.include_router(users_router, prefix=api_prefix)
-    app.include_router(organizations_router, prefix=api_prefix)
-    app.include_router(events_router, prefix=api_prefix)
-    app.include_router(participants_router, prefix=api_prefix)
-    app.include_router(stands_router, prefix=api_prefix)
-    # app.include_router(subscriptions_router, prefix=api_prefix)  # disabled
-    app.include_router(analytics_router, prefix=api_prefix)
-    app.include_router(notifications_router, prefix=api_prefix)
-    app.include_router(favorites_router, prefix=api_prefix)
+    ("auth", auth_router, "", None),
+    ("users", users_router, "", None),
+    ("organizations", organizations_router, "", None),
+    ("events", events_router, "", None),
+    ("participants", participants_router, "", None),
+    ("stands", stands_router, "", None),
+    # ("subscriptions", subscriptions_router, "", None),  # disabled
+    ("analytics", analytics_router, "", None),
+    ("notifications", notifications_router, "", None),
+    ("favorites", favorites_router, "", None),
     # Week 2: Governance & Monitoring
-    app.include_router(admin_router, prefix=api_prefix)
-    app.include_router(audit_router, prefix=api_prefix)
-    app.include_router(incidents_router, prefix=api_prefix)
-    app.include_router(payments_router, prefix=api_prefix)
+    ("admin", admin_router, "", None),
+    ("audit", audit_router, "", None),
+    ("incidents", incidents_router, "", None),
+    ("payments", payments_router, "", None),
     # Stand Marketplace (isolated from event payments)
-    app.include_router(marketplace_router, prefix=api_prefix)
-    app.include_router(finance_router, prefix=api_prefix)
+    ("marketplace", marketplace_router, "", None),
+    ("finance", finance_router, "", None),
     # Week 3: Live Monitoring
-    app.include_router(monitoring_router, prefix=api_prefix)
+    ("monitoring", monitoring_router, "", None),
     # Week 5: Conference Session Orchestration
-    app.include_router(sessions_router, prefix=api_prefix)
+    ("sessions", sessions_router, "", None),
     # Week 6: Organizer Value Dashboard
-    app.include_router(organizer_report_router, prefix=api_prefix)
+    ("organizer_report", organizer_report_router, "", None),
     # Week 7: Enterprise Ecosystem
-    app.include_router(enterprise_router, prefix=api_prefix)
+    ("enterprise", enterprise_router, "", None),
     # Conferences & Meetings video system
-    app.include_router(conferences_router, prefix=api_prefix)
+    ("conferences", conferences_router, "", None),
     # Legacy/extra routers (mounted with tags)
-    app.include_router(chat_router, prefix=f"{api_prefix}/chat", tags=["chat"])
+    ("chat", chat_router, "/chat", ["chat"]),
+    ("assistant", "app.modules.ai_rag.router", "/assistant", ["assistant"]),
+    ("translation", "app.modules.ai_translation.router", "/translation", ["translation"]),
+    ("transcripts", "app.modules.transcripts.router", "/transcripts", ["transcripts"]),
+    ("meetings", meetings_router, "/meetings", ["meetings"]),
+    ("resources", resources_router, "/resources", ["resources"]),
+    ("leads", leads_router, "/leads", ["leads"]),
+    ("recommendations", "app.modules.recommendations.router", "/recommendations", ["recommendations"]),
+]
+
+
+def _import_optional_router(module_path: str) -> APIRouter | None:
+    """Import an optional router module, or None if its dependencies are missing."""
+    try:
+        return importlib.import_module(module_path).router
+    except Exception:
+        return None
+
+
+def register_routers(app: FastAPI, settings: Settings) -> None:
+    """
+    Register all application routers.
+    """
+    api_prefix = settings.API_V1_STR
     logger = logging.getLogger(__name__)
-    if rag_router is not None:
-        app.include_router(rag_router, prefix=f"{api_prefix}/assistant", tags=["assistant"])
-    else:
-        logger.warning("assistant router disabled: optional AI dependencies failed to import")
-
-    if translation_router is not None:
-        app.include_router(translation_router, prefix=f"{api_prefix}/translation", tags=["translation"])
-    else:
-        logger.warning("translation router disabled: optional AI dependencies failed to import")
-
-    if transcripts_router is not None:
-        app.include_router(transcripts_router, prefix=f"{api_prefix}/transcripts", tags=["transcripts"])
-    else:
-        logger.warning("transcripts router disabled: optional AI dependencies failed to import")
-    app.include_router(meetings_router, prefix=f"{api_prefix}/meetings", tags=["meetings"])
-    app.include_router(resources_router, prefix=f"{api_prefix}/resources", tags=["resources"])
-    app.include_router(leads_router, prefix=f"{api_prefix}/leads", tags=["leads"])
-    if recommendations_router is not None:
-        app.include_router(recommendations_router, prefix=f"{api_prefix}/recommendations", tags=["recommendations"])
-    else:
-        logger.warning("recommendations router disabled: optional ML dependencies failed to import")
-    
+
+    for name, router, sub_prefix, tags in ROUTERS:
+        if isinstance(router, str):
+            if not settings.ENABLE_AI_ROUTERS:
+                logger.info(f"{name} router disabled by ENABLE_AI_ROUTERS")
+                continue
+            router = _import_optional_router(router)
+        if router is None:
+            logger.warning(f"{name} router disabled: optional dependencies failed to import")
+            continue
+        app.include_router(router, prefix=api_prefix + sub_prefix if sub_prefix else api_prefix, tags=tags)
+
     # Dev / Seeding
     if settings.ENV == "dev" or settings.DEBUG:
         from app.modules.dev.router import router as dev_router
@@ -183,19 +223,23 @@ def create_application() -> FastAPI:
         description="Backend API for the Intelligent Virtual Exhibition Platform",
         version="0.1.0",
         debug=settings.DEBUG,
-        openapi_url=f"{getattr(settings, 'API_V1_STR', '/api/v1')}/openapi.json" if settings.ENV == "dev" else None,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.ENV == "dev" else None,
         lifespan=lifespan,
         redirect_slashes=False,
     )
+    app.state.settings = settings
 
     # Add rate limiting middleware
     app.add_middleware(RateLimitMiddleware)
 
+    # Gzip responses >= 1 KB (assistant answers, lists); SSE streams pass through
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
     # Configure CORS from environment - CORSMiddleware should be LAST added to be OUTERMOST
     cors_origins = settings.CORS_ORIGINS
     if settings.ENV == "dev":
         # Include localhost variants in development
-        cors_origins = list(set(cors_origins + [
+        cors_origins = list(dict.fromkeys(cors_origins + [
             "http://localhost:3000",
             "http://127.0.0.1:3000",
             "http://localhost:3001",
@@ -206,12 +250,12 @@ def create_application() -> FastAPI:
         CORSMiddleware,
         allow_origins=cors_origins,
         allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+        allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
         allow_headers=["*"],
     )
 
     # Register routers
-    register_routers(app)
+    register_routers(app, settings)
 
     # Serve uploaded files (product images, resources, etc.)
     # __file__ is backend/app/main.py → go 2 levels up to reach backend/
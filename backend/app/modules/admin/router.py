@@ -3,10 +3,11 @@ Admin-specific routes: /admin/health, /admin/events/{event_id}/enterprise-reques
 /admin/events/{event_id}/force-start, /admin/events/{event_id}/force-close,
 /admin/event-join-requests, /admin/events/{event_id}/enterprises/{org_id}/approve|reject
 """
+import asyncio
 import time
 import os
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Body
 from datetime import datetime, timezone
 
 from app.core.dependencies import require_role
@@ -17,11 +18,11 @@ from app.modules.participants.schemas import EnterpriseRequestsResponse, Partici
 from app.modules.participants.service import list_enterprise_requests
 from app.modules.events.service import get_event_by_id, atomic_transition, resolve_event_id
 from app.modules.events.schemas import EventRead, EventState
-from app.modules.audit.service import log_audit
+from app.modules.audit.service import log_audit, queue_audit
 from app.modules.stands.service import get_stand_by_org, create_stand
 from app.modules.organizations.service import list_organizations
 from app.modules.admin.schemas import PartnerDashboardRead, PartnerStats
-from app.modules.users.service import list_all_users
+from app.modules.users.service import invalidate_user, list_all_users
 from bson import ObjectId
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -30,26 +31,39 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 # Record process start time for uptime calculation
 _START_TIME = time.time()
 
+# Dashboards and probes poll /admin/health; serve bursts from one result.
+_HEALTH_TTL_SECONDS = 10.0
+_MONGO_PING_TIMEOUT_SECONDS = 1.0
+_health_cache: Optional[tuple[float, dict]] = None
+_health_lock = asyncio.Lock()
 
-@router.get("/health")
-async def admin_health(
-    _: dict = Depends(require_role(Role.ADMIN)),
-):
-    """
-    Detailed platform health status (Admin only).
-    Returns MongoDB connection status, uptime, and worker/process info.
-    """
-    # MongoDB ping
-    mongo_ok = False
-    mongo_latency_ms = None
+
+async def _ping_mongo() -> tuple[bool, Optional[float]]:
+    """Return (ok, latency_ms) for a MongoDB ping bounded by a short timeout."""
     try:
         db = get_database()
         t0 = time.monotonic()
-        await db.command("ping")
-        mongo_latency_ms = round((time.monotonic() - t0) * 1000, 1)
-        mongo_ok = True
+        await asyncio.wait_for(db.command("ping"), timeout=_MONGO_PING_TIMEOUT_SECONDS)
+        return True, round((time.monotonic() - t0) * 1000, 1)
     except Exception:
-        mongo_latency_ms = None
+        return False, None
+
+
+def _index_status(app) -> str:
+    """Status of the background index build started by the app lifespan."""
+    index_task = getattr(app.state, "index_task", None)
+    if index_task is None:
+        return "not_started"
+    if not index_task.done():
+        return "building"
+    if index_task.cancelled() or index_task.exception() is not None:
+        return "error"
+    return "ok"
+
+
+async def _build_health(app) -> dict:
+    # MongoDB ping
+    mongo_ok, mongo_latency_ms = await _ping_mongo()
 
     uptime_seconds = int(time.time() - _START_TIME)
     uptime_str = _format_uptime(uptime_seconds)
@@ -61,7 +75,7 @@ async def admin_health(
 
     return {
         "status": overall,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "uptime": uptime_str,
         "uptime_seconds": uptime_seconds,
         "services": {
@@ -69,6 +83,9 @@ async def admin_health(
                 "status": "ok" if mongo_ok else "error",
                 "latency_ms": mongo_latency_ms,
             },
+            "indexes": {
+                "status": _index_status(app),
+            },
             "redis": {
                 "status": redis_status,
                 "latency_ms": None,
@@ -81,6 +98,29 @@ async def admin_health(
     }
 
 
+@router.get("/health")
+async def admin_health(
+    request: Request,
+    fresh: bool = Query(default=False, description="Bypass the cached result"),
+    _: dict = Depends(require_role(Role.ADMIN)),
+):
+    """
+    Detailed platform health status (Admin only).
+    Returns MongoDB connection status, uptime, and worker/process info.
+    Results are cached for a few seconds; pass fresh=true to re-probe.
+    """
+    global _health_cache
+    if not fresh and _health_cache and time.monotonic() - _health_cache[0] < _HEALTH_TTL_SECONDS:
+        return _health_cache[1]
+
+    async with _health_lock:
+        if not fresh and _health_cache and time.monotonic() - _health_cache[0] < _HEALTH_TTL_SECONDS:
+            return _health_cache[1]
+        payload = await _build_health(request.app)
+        _health_cache = (time.monotonic(), payload)
+    return payload
+
+
 @router.get("/events/{event_id}/enterprise-requests", response_model=EnterpriseRequestsResponse)
 async def get_enterprise_requests(
     event_id: str,
@@ -115,55 +155,67 @@ async def get_enterprise_requests(
 
 # ─── Force lifecycle transitions ─────────────────────────────────────────────
 
-@router.post(
-    "/events/{event_id}/force-start",
-    response_model=EventRead,
-    summary="Force-start an event (Admin only)",
-)
-async def force_start_event(
+async def _force_transition(
     event_id: str,
-    current_user: dict = Depends(require_role(Role.ADMIN)),
+    from_state: EventState,
+    to_state: EventState,
+    verb: str,
+    current_user: dict,
 ) -> EventRead:
     """
-    Force an event from PAYMENT_DONE → LIVE immediately, bypassing the schedule.
-
-    - ADMIN only
-    - Allowed only when `state == payment_done`
-    - Audit log: `event.force_start`
+    Apply a forced lifecycle transition in one conditional update.
+    The event is only re-read when the update did not match, to tell
+    "not found" apart from "wrong state".
     """
     event_id = await resolve_event_id(event_id)
-    event = await get_event_by_id(event_id)
-    if event is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
-
-    if event["state"] != EventState.PAYMENT_DONE:
+    updated = await atomic_transition(event_id, from_state, to_state)
+    if updated is None:
+        event = await get_event_by_id(event_id)
+        if event is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot force-start. Current state: {event['state']}. Required: payment_done",
+            detail=f"Cannot {verb}. Current state: {event['state']}. Required: {from_state.value}",
         )
 
-    updated = await atomic_transition(event_id, EventState.PAYMENT_DONE, EventState.LIVE)
-    if updated is None:
-        # Race — already transitioned
-        updated = await get_event_by_id(event_id)
-
-    await log_audit(
+    await queue_audit(
         actor_id=str(current_user["_id"]),
-        action="event.force_start",
+        action=f"event.{verb.replace('-', '_')}",
         entity="event",
         entity_id=event_id,
         metadata={
             "event_id": event_id,
-            "previous_state": "payment_done",
-            "new_state": "live",
+            "previous_state": from_state.value,
+            "new_state": to_state.value,
             "actor_id": str(current_user["_id"]),
-            "title": event.get("title"),
+            "title": updated.get("title"),
         },
     )
 
     return EventRead(**updated)
 
 
+@router.post(
+    "/events/{event_id}/force-start",
+    response_model=EventRead,
+    summary="Force-start an event (Admin only)",
+)
+async def force_start_event(
+    event_id: str,
+    current_user: dict = Depends(require_role(Role.ADMIN)),
+) -> EventRead:
+    """
+    Force an event from PAYMENT_DONE → LIVE immediately, bypassing the schedule.
+
+    - ADMIN only
+    - Allowed only when `state == payment_done`
+    - Audit log: `event.force_start`
+    """
+    return await _force_transition(
+        event_id, EventState.PAYMENT_DONE, EventState.LIVE, "force-start", current_user
+    )
+
+
 @router.post(
     "/events/{event_id}/force-close",
     response_model=EventRead,
@@ -180,37 +232,10 @@ async def force_close_event(
     - Allowed only when `state == live`
     - Audit log: `event.force_close`
     """
-    event_id = await resolve_event_id(event_id)
-    event = await get_event_by_id(event_id)
-    if event is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
-
-    if event["state"] != EventState.LIVE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot force-close. Current state: {event['state']}. Required: live",
-        )
-
-    updated = await atomic_transition(event_id, EventState.LIVE, EventState.CLOSED)
-    if updated is None:
-        updated = await get_event_by_id(event_id)
-
-    await log_audit(
-        actor_id=str(current_user["_id"]),
-        action="event.force_close",
-        entity="event",
-        entity_id=event_id,
-        metadata={
-            "event_id": event_id,
-            "previous_state": "live",
-            "new_state": "closed",
-            "actor_id": str(current_user["_id"]),
-            "title": event.get("title"),
-        },
+    return await _force_transition(
+        event_id, EventState.LIVE, EventState.CLOSED, "force-close", current_user
     )
 
-    return EventRead(**updated)
-
 
 def _format_uptime(seconds: int) -> str:
     days, rem = divmod(seconds, 86400)
@@ -264,6 +289,7 @@ async def approve_enterprise(user_id: str, current_user: dict = Depends(require_
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Enterprise user not found")
+    invalidate_user(user_id)
     await log_audit(actor_id=str(current_user["_id"]), action="enterprise.registration_approved", entity="user", entity_id=user_id)
     return {"message": "Enterprise approved"}
 
@@ -278,6 +304,7 @@ async def reject_enterprise(user_id: str, payload: dict = Body(...), current_use
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Enterprise user not found")
+    invalidate_user(user_id)
     await log_audit(actor_id=str(current_user["_id"]), action="enterprise.registration_rejected", entity="user", entity_id=user_id, metadata={"reason": reason})
     return {"message": "Enterprise rejected"}
 
@@ -327,6 +354,7 @@ async def approve_organizer(user_id: str, current_user: dict = Depends(require_r
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Organizer user not found")
+    invalidate_user(user_id)
     await log_audit(actor_id=str(current_user["_id"]), action="organizer.registration_approved", entity="user", entity_id=user_id)
     return {"message": "Organizer approved"}
 
@@ -341,6 +369,7 @@ async def reject_organizer(user_id: str, payload: dict = Body(...), current_user
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Organizer user not found")
+    invalidate_user(user_id)
     await log_audit(actor_id=str(current_user["_id"]), action="organizer.registration_rejected", entity="user", entity_id=user_id, metadata={"reason": reason})
     return {"message": "Organizer rejected"}
 
@@ -2,9 +2,12 @@
 Text Chunker for document preprocessing.
 Splits long documents into smaller chunks for better retrieval.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Paragraphs, lines, sentences, words, then characters
+DEFAULT_SEPARATORS = ("\n\n", "\n", ". ", " ", "")
+
 
 class DocumentChunker:
     """
@@ -26,51 +29,16 @@ class DocumentChunker:
             chunk_overlap: Number of overlapping characters between chunks
             separators: Custom separators for splitting (default: paragraphs, sentences, words)
         """
-        if separators is None:
-            separators = ["\n\n", "\n", ". ", " ", ""]
-        
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            separators=separators,
+            separators=list(separators or DEFAULT_SEPARATORS),
             length_function=len
         )
     
     def chunk_text(self, text: str) -> List[str]:
         """Split a single text into chunks."""
         return self.splitter.split_text(text)
-    
-    def chunk_document(
-        self,
-        text: str,
-        metadata: Dict[str, Any] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Split a document and attach metadata to each chunk.
-        
-        Args:
-            text: The document text to split
-            metadata: Base metadata to attach to all chunks
-        
-        Returns:
-            List of chunk dictionaries with text and metadata
-        """
-        if metadata is None:
-            metadata = {}
-        
-        chunks = self.chunk_text(text)
-        
-        return [
-            {
-                "text": chunk,
-                "metadata": {
-                    **metadata,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                }
-            }
-            for i, chunk in enumerate(chunks)
-        ]
 
 
 # Default chunker instance
@@ -79,26 +47,21 @@ default_chunker = DocumentChunker()
 
 def chunk_for_ingestion(
     content: str,
-    source: str = None,
-    scope: str = None,
-    **extra_metadata
-) -> List[Dict[str, Any]]:
+    doc_id: str,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
     """
     Convenience function to chunk content for vector store ingestion.
     
+    Document-level fields (source, scope, total_chunks, extras) live once in
+    the assistant_documents header; each chunk only references it.
+    
     Args:
         content: The text content to chunk
-        source: Source identifier (URL, filename, etc.)
-        scope: Scope identifier (platform, event_id, stand_id)
-        **extra_metadata: Additional metadata fields
+        doc_id: Id of the document header the chunks belong to
     
     Returns:
-        List of chunks ready for vector store ingestion
+        (texts, metadatas) ready for VectorStore.add_documents
     """
-    metadata = {
-        "source": source or "unknown",
-        "scope": scope or "platform",
-        **extra_metadata
-    }
-    
-    return default_chunker.chunk_document(content, metadata)
+    texts = default_chunker.chunk_text(content)
+    metadatas = [{"doc_id": doc_id, "chunk_index": i} for i in range(len(texts))]
+    return texts, metadatas
@@ -0,0 +1,242 @@
+"""
+FAISS-backed vector store, selected with VECTOR_BACKEND=faiss.
+Same surface as VectorStore; chunk text and metadata live in a side SQLite table.
+
+The backends do not share storage: switching VECTOR_BACKEND starts from an
+empty index, so documents already in Chroma must be re-ingested.
+"""
+import logging
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from typing import List, Optional, Dict, Any
+
+import faiss
+import numpy as np
+
+from .vector_store import (
+    CHROMA_PERSIST_DIR,
+    SearchHit,
+    _QueryCache,
+    _get_collection_or_none,
+    encode_texts,
+    get_chroma_client,
+)
+
+logger = logging.getLogger(__name__)
+
+FAISS_PERSIST_DIR = os.path.join(CHROMA_PERSIST_DIR, "..", "faiss")
+
+# Below this many vectors an exact flat index is both faster and more accurate;
+# past it the index is retrained as IVF-PQ (48 x 8-bit codes per vector)
+IVFPQ_MIN_VECTORS = 10_000
+IVFPQ_SUBQUANTIZERS = 48
+IVFPQ_BITS = 8
+IVFPQ_NPROBE = 16
+
+
+def _unit_rows(vectors: List[List[float]]) -> np.ndarray:
+    x = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(x)
+    return x
+
+
+def _matches(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Equality-only subset of Chroma's where filter."""
+    return all(metadata.get(key) == value for key, value in where.items())
+
+
+class FaissVectorStore:
+    """
+    FAISS vector store with inner-product search over unit vectors (cosine).
+    Starts as an exact IndexFlatIP and switches to IndexIVFPQ once it holds
+    IVFPQ_MIN_VECTORS, trading a little recall for ~30x less vector memory.
+    """
+
+    def __init__(self, collection_name: str = "ivep_documents"):
+        self.collection_name = collection_name
+        self._dir = os.path.join(FAISS_PERSIST_DIR, collection_name)
+        os.makedirs(self._dir, exist_ok=True)
+        self._index_path = os.path.join(self._dir, "index.faiss")
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(os.path.join(self._dir, "chunks.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id INTEGER PRIMARY KEY, uid TEXT UNIQUE NOT NULL, document TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+
+        self.index = faiss.read_index(self._index_path) if os.path.exists(self._index_path) else None
+        if self.index is not None and self._is_ivf():
+            faiss.downcast_index(self.index.index).nprobe = IVFPQ_NPROBE
+
+        # Near-duplicate queries skip the ANN search; cleared on every write
+        self.query_cache = _QueryCache()
+
+        if self.index is None:
+            self._warn_if_chroma_has_data()
+
+    def _warn_if_chroma_has_data(self) -> None:
+        """Nothing is migrated between backends; say so when Chroma holds this collection."""
+        try:
+            collection = _get_collection_or_none(get_chroma_client(), self.collection_name)
+            count = collection.count() if collection is not None else 0
+        except Exception:
+            return
+        if count:
+            logger.warning(
+                f"FAISS index for {self.collection_name} is empty but Chroma holds {count} chunks; "
+                "re-ingest the documents to search them with VECTOR_BACKEND=faiss"
+            )
+
+    def generate_embedding(self, text: str) -> List[float]:
+        """Generate embedding vector for a single text."""
+        return encode_texts([text])[0]
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts (batch processing)."""
+        return encode_texts(texts)
+
+    def _is_ivf(self) -> bool:
+        return isinstance(faiss.downcast_index(self.index.index), faiss.IndexIVF)
+
+    def _all_vectors(self) -> tuple:
+        """(vectors, ids) currently held by a flat index, for retraining."""
+        flat = faiss.downcast_index(self.index.index)
+        vectors = flat.reconstruct_n(0, flat.ntotal)
+        ids = faiss.vector_to_array(self.index.id_map)
+        return vectors, ids
+
+    def _maybe_upgrade(self) -> None:
+        """Retrain the flat index as IVF-PQ once it is large enough."""
+        if self.index.ntotal < IVFPQ_MIN_VECTORS or self._is_ivf():
+            return
+        vectors, ids = self._all_vectors()
+        nlist = int(np.sqrt(len(vectors)))
+        quantizer = faiss.IndexFlatIP(vectors.shape[1])
+        ivf = faiss.IndexIVFPQ(
+            quantizer, vectors.shape[1], nlist, IVFPQ_SUBQUANTIZERS, IVFPQ_BITS, faiss.METRIC_INNER_PRODUCT
+        )
+        ivf.train(vectors)
+        ivf.nprobe = IVFPQ_NPROBE
+        index = faiss.IndexIDMap2(ivf)
+        index.add_with_ids(vectors, ids)
+        self.index = index
+
+    def add_documents(
+        self,
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
+    ) -> List[str]:
+        """Add documents to the vector store; returns their string IDs."""
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in documents]
+        if metadatas is None:
+            metadatas = [{} for _ in documents]
+        if embeddings is None:
+            embeddings = self.generate_embeddings(documents)
+
+        vectors = _unit_rows(embeddings)
+        with self._lock:
+            if self.index is None:
+                self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
+            with self._db:
+                rowids = [
+                    self._db.execute(
+                        "INSERT INTO chunks (uid, document, metadata) VALUES (?, ?, ?)",
+                        (uid, doc, json.dumps(meta)),
+                    ).lastrowid
+                    for uid, doc, meta in zip(ids, documents, metadatas)
+                ]
+            self.index.add_with_ids(vectors, np.asarray(rowids, dtype=np.int64))
+            self._maybe_upgrade()
+            faiss.write_index(self.index, self._index_path)
+        self.query_cache.clear()
+
+        return ids
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[SearchHit]:
+        """Search for similar documents; distance is cosine distance, as with Chroma."""
+        if query_embedding is None:
+            query_embedding = self.generate_embedding(query)
+
+        cache_key = (top_k, repr(filter_metadata))
+        cached = self.query_cache.get(query_embedding, cache_key)
+        if cached is not None:
+            return cached
+
+        if self.index is None or self.index.ntotal == 0:
+            return []
+
+        # The filter is applied after the ANN search, so over-fetch, and widen
+        # the search until top_k hits pass it or k covers the whole index
+        query_vector = _unit_rows([query_embedding])
+        k = top_k * 4 if filter_metadata else top_k
+        while True:
+            formatted_results = self._search_rows(query_vector, k, top_k, filter_metadata)
+            if len(formatted_results) == top_k or k >= self.index.ntotal:
+                break
+            k *= 4
+
+        self.query_cache.put(query_embedding, cache_key, formatted_results)
+        return formatted_results
+
+    def _search_rows(
+        self, query: np.ndarray, k: int, top_k: int, filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[SearchHit]:
+        """The first top_k of the k nearest chunks that pass filter_metadata."""
+        with self._lock:
+            scores, rowids = self.index.search(query, k)
+            hits = [(int(i), float(s)) for i, s in zip(rowids[0], scores[0]) if i != -1]
+            rows = {
+                row[0]: row[1:]
+                for row in self._db.execute(
+                    f"SELECT id, uid, document, metadata FROM chunks WHERE id IN ({','.join('?' * len(hits))})",
+                    [i for i, _ in hits],
+                )
+            } if hits else {}
+
+        results: List[SearchHit] = []
+        for rowid, score in hits:
+            if rowid not in rows:
+                continue
+            uid, document, metadata = rows[rowid]
+            metadata = json.loads(metadata)
+            if filter_metadata and not _matches(metadata, filter_metadata):
+                continue
+            results.append(SearchHit(uid, document, metadata, 1.0 - score))
+            if len(results) == top_k:
+                break
+        return results
+
+    def delete(self, ids: List[str]) -> None:
+        """Delete documents by their IDs."""
+        if not ids:
+            return
+        with self._lock:
+            placeholders = ",".join("?" * len(ids))
+            rowids = [row[0] for row in self._db.execute(f"SELECT id FROM chunks WHERE uid IN ({placeholders})", ids)]
+            with self._db:
+                self._db.execute(f"DELETE FROM chunks WHERE uid IN ({placeholders})", ids)
+            if self.index is not None and rowids:
+                self.index.remove_ids(np.asarray(rowids, dtype=np.int64))
+                faiss.write_index(self.index, self._index_path)
+        self.query_cache.clear()
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """Get statistics about the collection."""
+        return {
+            "name": self.collection_name,
+            "count": self.index.ntotal if self.index is not None else 0
+        }
@@ -11,8 +11,19 @@ from .service import rag_service
 from ...core.dependencies import get_current_user
 import json
 
+try:  # optional speedup for per-chunk SSE encoding
+    from orjson import dumps as _json_dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 router = APIRouter()
 
+# Pre-encoded SSE framing
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+
 
 class QueryWithSourcesRequest(BaseModel):
     """Request model for non-streaming query with sources."""
@@ -52,8 +63,8 @@ async def query_assistant(
             scope=scope,
             use_retrieval=True
         ):
-            yield f"data: {json.dumps({'text': chunk})}\n\n"
-        yield "data: [DONE]\n\n"
+            yield _SSE_PREFIX + _json_dumps({"text": chunk}) + _SSE_SUFFIX
+        yield _SSE_DONE
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -77,6 +88,36 @@ async def query_with_sources(
     return result
 
 
+@router.post("/{scope}/query-with-sources/stream")
+async def stream_query_with_sources(
+    scope: str,
+    request: QueryWithSourcesRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Streaming variant of query-with-sources.
+    Sends a {"sources": [...]} frame first, then {"text": ...} frames, then [DONE].
+    """
+    results, sources = await rag_service.search_with_sources(
+        query=request.query,
+        scope=scope,
+        top_k=request.top_k,
+    )
+
+    async def event_generator():
+        yield _SSE_PREFIX + _json_dumps({"sources": sources}) + _SSE_SUFFIX
+        async for chunk in rag_service.stream_query(
+            query=request.query,
+            scope=scope,
+            top_k=request.top_k,
+            vector_results=results,
+        ):
+            yield _SSE_PREFIX + _json_dumps({"text": chunk}) + _SSE_SUFFIX
+        yield _SSE_DONE
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @router.post("/{scope}/ingest")
 async def ingest_document(
     scope: str,
@@ -152,10 +193,9 @@ async def delete_documents(
     document_ids: List[str] = Body(...),
     current_user: dict = Depends(get_current_user)
 ):
-    """Delete specific documents from the knowledge base."""
-    vector_store = rag_service.get_vector_store(scope)
-    vector_store.delete(document_ids)
-    return {"status": "deleted", "count": len(document_ids)}
+    """Delete chunks (by chunk id) or whole documents (by doc_id) from the knowledge base."""
+    count = await rag_service.delete_documents(scope, document_ids)
+    return {"status": "deleted", "count": count}
 
 
 @router.get("/session/{id}", response_model=SessionResponse)
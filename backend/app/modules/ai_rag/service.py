@@ -3,13 +3,56 @@ Enhanced RAG Service with Vector Search and Semantic Retrieval.
 This implementation does NOT call external LLMs; it answers directly from retrieved context
 or returns an explicit "I don't know" when no context is available.
 """
-import json
+import asyncio
 import re
-from typing import AsyncGenerator, List, Dict, Any, Optional
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncGenerator, List, Dict, Any, Optional, Tuple
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+from app.core.config import settings
 from app.db.mongo import get_database
-from .vector_store import get_vector_store
+from .vector_store import SearchHit, embed_texts, get_vector_store
 from .chunker import chunk_for_ingestion
 
+# Document headers (source, scope, total_chunks, extras) keyed by doc_id;
+# chunks in Chroma only carry {doc_id, chunk_index}. Cleared when full.
+_DOC_HEADER_CACHE_MAX = 1024
+_doc_headers: Dict[str, Dict[str, Any]] = {}
+
+# Header fields owned by ingest; caller metadata may not override them
+_RESERVED_HEADER_KEYS = frozenset({"_id", "created_at", "source", "scope", "total_chunks"})
+
+NO_CONTEXT_ANSWER = "I don't have access to that information right now."
+
+# Query words worth matching on (3+ alphanumerics)
+_WORD_RE = re.compile(r"[A-Za-z0-9]{3,}")
+
+
+# Fields each fact line reads; everything else stays on the server
+_STAND_FACT_PROJ = {"name": 1, "stand_type": 1, "_id": 0}
+_RESOURCE_FACT_PROJ = {"title": 1, "type": 1, "file_path": 1, "_id": 0}
+_EVENT_FACT_PROJ = {"title": 1, "state": 1, "start_date": 1, "end_date": 1, "_id": 0}
+_EVENT_STAND_FACT_PROJ = {"name": 1, "organization_id": 1, "_id": 0}
+_SEARCH_EVENT_PROJ = {"title": 1, "state": 1, "_id": 0}
+_SEARCH_STAND_PROJ = {"name": 1, "event_id": 1, "_id": 0}
+
+
+# 24 hex chars: the only string form ObjectId accepts
+_OID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+def _ref_query(ref: str) -> dict:
+    """Match by _id when ref is an ObjectId, else by the legacy string id (uuid4)."""
+    return {"_id": ObjectId(ref)} if _OID_RE.fullmatch(ref) else {"id": ref}
+
+
+@lru_cache(maxsize=1024)
+def _build_regex(terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Case-insensitive alternation of terms; pymongo encodes it as a BSON regex."""
+    return re.compile("|".join(terms), re.IGNORECASE)
+
 
 class RAGService:
     """
@@ -21,49 +64,113 @@ class RAGService:
         """Get the vector store for a specific scope."""
         return get_vector_store(scope)
 
+    async def _hydrate_metadata(self, results: List[SearchHit]) -> List[SearchHit]:
+        """Merge each chunk's document header into its metadata (legacy chunks carry their own)."""
+        missing = set()
+        for r in results:
+            doc_id = (r.metadata or {}).get("doc_id")
+            if doc_id and doc_id not in _doc_headers:
+                missing.add(doc_id)
+
+        if missing:
+            if len(_doc_headers) + len(missing) > _DOC_HEADER_CACHE_MAX:
+                _doc_headers.clear()
+            db = get_database()
+            cursor = db.assistant_documents.find({"_id": {"$in": list(missing)}}, {"created_at": 0})
+            async for header in cursor:
+                _doc_headers[header.pop("_id")] = header
+
+        hydrated = []
+        for r in results:
+            meta = r.metadata or {}
+            header = _doc_headers.get(meta.get("doc_id"))
+            hydrated.append(r._replace(metadata={**header, **meta}) if header else r)
+        return hydrated
+
+    async def _search(self, query: str, scope: str, top_k: int) -> List[SearchHit]:
+        """Vector search off the event loop, with document headers hydrated."""
+        vector_store = self.get_vector_store(scope)
+        query_embedding = (await embed_texts([query]))[0]
+        results = await asyncio.to_thread(
+            vector_store.search, query, top_k=top_k, query_embedding=query_embedding
+        )
+        return await self._hydrate_metadata(results)
+
+    async def _text_search(
+        self,
+        collection: str,
+        field: str,
+        query: str,
+        terms: Tuple[str, ...],
+        top_k: int,
+        projection: Dict[str, int],
+    ) -> List[Dict[str, Any]]:
+        """Indexed full-text lookup on one field, best matches first."""
+        db = get_database()
+        try:
+            if settings.MONGO_ATLAS_SEARCH:
+                pipeline = [
+                    {"$search": {"index": "default", "text": {"query": query, "path": [field]}}},
+                    {"$limit": top_k},
+                    {"$project": projection},
+                ]
+                return await db[collection].aggregate(pipeline).to_list(length=top_k)
+
+            cursor = (
+                db[collection]
+                .find(
+                    {"$text": {"$search": " ".join(terms) or query}},
+                    {**projection, "score": {"$meta": "textScore"}},
+                )
+                .sort([("score", {"$meta": "textScore"})])
+                .limit(top_k)
+            )
+            return await cursor.to_list(length=top_k)
+        except OperationFailure:
+            # Search index missing or still being built (ensure_indexes runs in the background)
+            regex = _build_regex(terms or (re.escape(query),))
+            cursor = db[collection].find({field: regex}, projection).limit(top_k)
+            return await cursor.to_list(length=top_k)
+
     async def _retrieve_db_facts(self, query: str, scope: str, top_k: int = 5) -> List[str]:
         """Lightweight DB lookup to surface factual data when present."""
         db = get_database()
-        terms = [t for t in re.findall(r"[A-Za-z0-9]+", query) if len(t) > 2]
-        pattern = "|".join(terms) if terms else re.escape(query)
-        regex = {"$regex": pattern, "$options": "i"}
+        terms = tuple(sorted({m.group() for m in _WORD_RE.finditer(query)}))
         facts: List[str] = []
 
         # Scope-aware searches
         if scope.startswith("stand-"):
             stand_id = scope.replace("stand-", "")
-            stand_query = [{"id": stand_id}]
-            from bson import ObjectId
-            if ObjectId.is_valid(stand_id):
-                stand_query.append({"_id": ObjectId(stand_id)})
-            stand = await db.stands.find_one({"$or": stand_query})
+            # The stand and its resources are independent; fetch them concurrently
+            stand, resources = await asyncio.gather(
+                db.stands.find_one(_ref_query(stand_id), _STAND_FACT_PROJ),
+                db.resources.find({"stand_id": stand_id}, _RESOURCE_FACT_PROJ).limit(top_k).to_list(length=top_k),
+            )
             if stand:
                 facts.append(f"Stand: {stand.get('name', 'Unknown')} (type: {stand.get('stand_type', 'standard')})")
-            # Resources for this stand
-            cursor = db.resources.find({"stand_id": stand_id}).limit(top_k)
-            async for res in cursor:
+            for res in resources:
                 facts.append(f"Resource: {res.get('title', 'Untitled')} [{res.get('type', 'file')}] at {res.get('file_path', '')}")
 
         elif scope.startswith("event-"):
             event_id = scope.replace("event-", "")
-            event_query = [{"id": event_id}]
-            from bson import ObjectId
-            if ObjectId.is_valid(event_id):
-                event_query.append({"_id": ObjectId(event_id)})
-            event = await db.events.find_one({"$or": event_query})
+            event, stands = await asyncio.gather(
+                db.events.find_one(_ref_query(event_id), _EVENT_FACT_PROJ),
+                db.stands.find({"event_id": event_id}, _EVENT_STAND_FACT_PROJ).limit(top_k).to_list(length=top_k),
+            )
             if event:
                 facts.append(f"Event: {event.get('title', 'Unknown')} (state: {event.get('state', '')}, dates: {event.get('start_date', '')} - {event.get('end_date', '')})")
-            cursor = db.stands.find({"event_id": event_id}).limit(top_k)
-            async for stand in cursor:
+            for stand in stands:
                 facts.append(f"Stand: {stand.get('name', 'Unknown')} (org {stand.get('organization_id', '')})")
 
         else:
-            # Platform-wide quick search on events/stands names (partial match)
-            cursor = db.events.find({"title": regex}).limit(top_k)
-            async for ev in cursor:
+            # Platform-wide indexed search on event titles and stand names
+            events, stands = await asyncio.gather(
+                self._text_search("events", "title", query, terms, top_k, _SEARCH_EVENT_PROJ),
+                self._text_search("stands", "name", query, terms, top_k, _SEARCH_STAND_PROJ),
+            )
+            for ev in events:
                 facts.append(f"Event: {ev.get('title', 'Unknown')} (state: {ev.get('state', '')})")
-            cursor = db.stands.find({"name": regex}).limit(top_k)
-            async for st in cursor:
+            for st in stands:
                 facts.append(f"Stand: {st.get('name', 'Unknown')} (event {st.get('event_id', '')})")
 
         return facts
@@ -87,27 +194,85 @@ class RAGService:
         Returns:
             Ingestion result with chunk count and IDs
         """
-        # Chunk the document
-        chunks = chunk_for_ingestion(content, source=source, scope=scope, **metadata)
+        # Chunk the document into parallel text/metadata lists
+        doc_id = uuid.uuid4().hex
+        texts, metadatas = chunk_for_ingestion(content, doc_id)
         
         # Get vector store for scope
         vector_store = self.get_vector_store(scope)
         
-        # Extract texts and metadata
-        texts = [chunk["text"] for chunk in chunks]
-        metadatas = [chunk["metadata"] for chunk in chunks]
-        
-        # Add to vector store
-        ids = vector_store.add_documents(documents=texts, metadatas=metadatas)
+        ids: List[str] = []
+        if texts:
+            # Embed through the shared batcher (coalesces concurrent ingests), then add off the event loop.
+            # Chunk ids derive from doc_id so a whole document can be deleted by its doc_id.
+            embeddings = await embed_texts(texts)
+            ids = await asyncio.to_thread(
+                vector_store.add_documents,
+                documents=texts,
+                metadatas=metadatas,
+                ids=[f"{doc_id}:{i}" for i in range(len(texts))],
+                embeddings=embeddings,
+            )
+
+            # Store the invariant metadata once, only after its chunks are stored
+            header = {
+                "source": source or "unknown",
+                "scope": scope or "platform",
+                "total_chunks": len(texts),
+                **{k: v for k, v in metadata.items() if k not in _RESERVED_HEADER_KEYS},
+            }
+            db = get_database()
+            await db.assistant_documents.insert_one(
+                {**header, "_id": doc_id, "created_at": datetime.now(timezone.utc)}
+            )
         
         return {
             "status": "success",
             "scope": scope,
             "source": source,
+            "doc_id": doc_id,
             "chunks_created": len(ids),
             "chunk_ids": ids
         }
     
+    async def delete_documents(self, scope: str, ids: List[str]) -> int:
+        """
+        Delete chunks by id, or whole documents by doc_id (all their chunks).
+        A document's header is removed once all of its chunks are gone.
+        """
+        # Headers are matched within the scope, as ingest_document writes them
+        scope = scope or "platform"
+        db = get_database()
+        headers = await db.assistant_documents.find(
+            {"_id": {"$in": ids}, "scope": scope}, {"total_chunks": 1}
+        ).to_list(length=None)
+        whole = {h["_id"]: h.get("total_chunks", 0) for h in headers}
+
+        named_chunks = [i for i in ids if i not in whole]
+        chunk_ids = list(named_chunks)
+        for doc_id, total in whole.items():
+            chunk_ids.extend(f"{doc_id}:{n}" for n in range(total))
+        vector_store = self.get_vector_store(scope)
+        await asyncio.to_thread(vector_store.delete, chunk_ids)
+
+        # Documents whose every chunk id was named are gone too
+        named: Dict[str, set] = {}
+        for chunk_id in named_chunks:
+            doc_id, sep, index = chunk_id.rpartition(":")
+            if sep and index.isdigit():
+                named.setdefault(doc_id, set()).add(int(index))
+        if named:
+            async for h in db.assistant_documents.find(
+                {"_id": {"$in": list(named)}, "scope": scope}, {"total_chunks": 1}
+            ):
+                if len(named[h["_id"]]) >= h.get("total_chunks", 0):
+                    whole[h["_id"]] = h["total_chunks"]
+        if whole:
+            await db.assistant_documents.delete_many({"_id": {"$in": list(whole)}, "scope": scope})
+            for doc_id in whole:
+                _doc_headers.pop(doc_id, None)
+        return len(ids)
+
     async def retrieve_context(
         self,
         query: str,
@@ -125,20 +290,61 @@ class RAGService:
         Returns:
             Concatenated context string
         """
-        vector_store = self.get_vector_store(scope)
-        results = vector_store.search(query, top_k=top_k)
+        results = await self._search(query, scope, top_k)
         
         if not results:
             return ""
         
         # Format context with source attribution
-        context_parts = []
-        for i, result in enumerate(results, 1):
-            source = result.get("metadata", {}).get("source", "Unknown")
-            context_parts.append(f"[Source {i}: {source}]\n{result['document']}")
-        
-        return "\n\n---\n\n".join(context_parts)
+        return "\n\n---\n\n".join(
+            f"[Source {i}: {hit.source}]\n{hit.document}"
+            for i, hit in enumerate(results, 1)
+        )
     
+    async def _gather_context(
+        self,
+        query: str,
+        scope: str,
+        top_k: int,
+        use_retrieval: bool = True,
+        vector_results: Optional[List[SearchHit]] = None,
+    ) -> Tuple[List[SearchHit], List[str]]:
+        """
+        Vector results and DB facts for a query, fetched concurrently.
+        Pass vector_results to reuse a search the caller already ran.
+        """
+        if vector_results is None and use_retrieval:
+            return await asyncio.gather(
+                self._search(query, scope, top_k),
+                self._retrieve_db_facts(query, scope, top_k=top_k),
+            )
+        db_facts = await self._retrieve_db_facts(query, scope, top_k=top_k)
+        return vector_results or [], db_facts
+
+    @staticmethod
+    def _vector_block(vector_results: List[SearchHit]) -> str:
+        return "\n\n".join(
+            f"[Vector {i}: {hit.source}]\n{hit.document}"
+            for i, hit in enumerate(vector_results, 1)
+        )
+
+    @staticmethod
+    def _facts_block(db_facts: List[str]) -> str:
+        return "\n\n".join(f"[DB {i}] {fact}" for i, fact in enumerate(db_facts, 1))
+
+    @classmethod
+    def _build_answer(cls, vector_results: List[SearchHit], db_facts: List[str]) -> str:
+        """Answer text from retrieved context, or NO_CONTEXT_ANSWER when there is none."""
+        blocks = [block for block in (cls._vector_block(vector_results), cls._facts_block(db_facts)) if block]
+        return "\n\n".join(blocks) if blocks else NO_CONTEXT_ANSWER
+
+    @staticmethod
+    def _sources(vector_results: List[SearchHit]) -> List[Dict[str, Any]]:
+        return [
+            {"source": hit.source, "relevance": 1.0 - (hit.distance or 0.0)}
+            for hit in vector_results
+        ]
+
     async def stream_query(
         self,
         query: str,
@@ -146,32 +352,56 @@ class RAGService:
         use_retrieval: bool = True,
         model: str = None,
         top_k: int = 3,
+        vector_results: Optional[List[SearchHit]] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Stream a response using only retrieved context (no external LLM calls).
         If no context is found, respond with an explicit fallback.
+        Pass vector_results to reuse a search the caller already ran.
         """
-        context_blocks: List[str] = []
-
-        if use_retrieval:
-            vector_store = self.get_vector_store(scope)
-            results = vector_store.search(query, top_k=top_k)
-            for i, result in enumerate(results, 1):
-                source = result.get("metadata", {}).get("source", "Unknown")
-                context_blocks.append(f"[Vector {i}: {source}]\n{result['document']}")
-
-        # Add structured DB facts
-        db_facts = await self._retrieve_db_facts(query, scope, top_k=top_k)
-        for i, fact in enumerate(db_facts, 1):
-            context_blocks.append(f"[DB {i}] {fact}")
-
-        if not context_blocks:
-            yield "I don't have access to that information right now."
+        if vector_results is not None or not use_retrieval:
+            vector_results, db_facts = await self._gather_context(
+                query, scope, top_k, use_retrieval=use_retrieval, vector_results=vector_results
+            )
+            yield self._build_answer(vector_results, db_facts)
             return
 
-        answer = "\n\n".join(context_blocks)
-        yield answer
+        # Run both lookups at once and emit each block as soon as its lookup finishes
+        vector_task = asyncio.create_task(self._search(query, scope, top_k))
+        facts_task = asyncio.create_task(self._retrieve_db_facts(query, scope, top_k=top_k))
+        pending = {vector_task, facts_task}
+        emitted = False
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is vector_task:
+                        block = self._vector_block(task.result())
+                    else:
+                        block = self._facts_block(task.result())
+                    if block:
+                        yield f"\n\n{block}" if emitted else block
+                        emitted = True
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if not emitted:
+            yield NO_CONTEXT_ANSWER
     
+    async def search_with_sources(
+        self,
+        query: str,
+        scope: str = "platform",
+        top_k: int = 3,
+    ) -> Tuple[List[SearchHit], List[Dict[str, Any]]]:
+        """
+        Run the vector search once and return (results, sources).
+        Pass the results on to stream_query(vector_results=...) to reuse them.
+        """
+        results = await self._search(query, scope, top_k)
+        return results, self._sources(results)
+
     async def query_with_sources(
         self,
         query: str,
@@ -191,25 +421,12 @@ class RAGService:
         Returns:
             Response with answer and sources
         """
-        # Get context and sources
-        vector_store = self.get_vector_store(scope)
-        results = vector_store.search(query, top_k=top_k)
-
-        sources = [
-            {
-                "source": r.get("metadata", {}).get("source", "Unknown"),
-                "relevance": 1 - r.get("distance", 0)
-            }
-            for r in results
-        ]
-
-        response_text = ""
-        async for chunk in self.stream_query(query, scope=scope, top_k=top_k):
-            response_text += chunk
+        # One retrieval pass (vector search and DB facts in parallel) feeds both fields
+        results, db_facts = await self._gather_context(query, scope, top_k)
 
         return {
-            "answer": response_text,
-            "sources": sources,
+            "answer": self._build_answer(results, db_facts),
+            "sources": self._sources(results),
             "scope": scope
         }
     
@@ -2,17 +2,437 @@
 Vector Store Service using ChromaDB for semantic search.
 Handles document storage, embedding generation, and similarity retrieval.
 """
-from typing import List, Optional, Dict, Any
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Dict, Any, Union
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
 import uuid
 import os
 
+from app.core.config import settings
+
+try:
+    import onnxruntime
+except ImportError:  # optional: CPU hosts fall back to quantized PyTorch
+    onnxruntime = None
+
+logger = logging.getLogger(__name__)
+
 # Persist directory for ChromaDB
 CHROMA_PERSIST_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "chroma_db")
 os.makedirs(CHROMA_PERSIST_DIR, exist_ok=True)
 
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# INT8 ONNX export from scripts/export_embedding_onnx.py, used on CPU when present
+EMBEDDING_ONNX_DIR = os.path.join(CHROMA_PERSIST_DIR, "..", "onnx", EMBEDDING_MODEL_NAME)
+EMBEDDING_ONNX_FILE = os.path.join(EMBEDDING_ONNX_DIR, "model_int8.onnx")
+EMBEDDING_MAX_TOKENS = 256  # all-MiniLM-L6-v2's max_seq_length
+
+# FP16 on GPU; on CPU, ONNX Runtime INT8 if exported, else dynamic INT8 Linear layers
+EMBEDDING_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+USE_ONNX_EMBEDDINGS = (
+    EMBEDDING_DEVICE == "cpu" and onnxruntime is not None and os.path.exists(EMBEDDING_ONNX_FILE)
+)
+if EMBEDDING_DEVICE == "cuda":
+    EMBEDDING_PRECISION = "fp16"
+else:
+    EMBEDDING_PRECISION = "onnx-int8" if USE_ONNX_EMBEDDINGS else "int8"
+
+# Chunks encoded per forward pass when embedding documents
+EMBEDDING_BATCH_SIZE = 64
+
+# Embedding cache: in-process dict in front of a persistent SQLite table
+# of float16 vectors, keyed by sha256(model + precision + normalized text)
+EMBEDDING_CACHE_PATH = os.path.join(CHROMA_PERSIST_DIR, "..", "embedding_cache.sqlite3")
+_EMBED_MEMO_MAX = 4096
+_SQLITE_MAX_VARS = 500
+_embed_memo: Dict[bytes, List[float]] = {}
+_embed_cache_lock = threading.Lock()
+
+# Cross-request batching: cache misses queued while an encode runs share the next one
+_EMBED_BATCH_MAX = 64
+
+# Semantic query cache: a query within this cosine of a recent one reuses its results
+QUERY_CACHE_SIZE = 512
+QUERY_CACHE_THRESHOLD = 0.95
+QUERY_CACHE_TTL_SECONDS = 300
+
+# The batching worker belongs to the event loop that started it
+_embed_loop: Optional[asyncio.AbstractEventLoop] = None
+_embed_queue: Optional[asyncio.Queue] = None
+_embed_task: Optional[asyncio.Task] = None
+
+
+class OnnxEmbedder:
+    """
+    SentenceTransformer.encode-compatible wrapper over the INT8 ONNX export:
+    tokenize, run the ORT session, mean-pool over the attention mask.
+    """
+
+    def __init__(self, model_dir: str = EMBEDDING_ONNX_DIR):
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = os.cpu_count() or 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            EMBEDDING_ONNX_FILE, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else sentences
+        pooled_batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=EMBEDDING_MAX_TOKENS,
+                return_tensors="np",
+            )
+            feeds = {name: batch[name].astype(np.int64) for name in self._input_names if name in batch}
+            hidden = self.session.run(None, feeds)[0]
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            pooled_batches.append(pooled)
+        vectors = np.concatenate(pooled_batches) if pooled_batches else np.zeros((0, 0), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model() -> Union[SentenceTransformer, OnnxEmbedder]:
+    """Load the embedding model once; every scope's store shares it."""
+    if USE_ONNX_EMBEDDINGS:
+        return OnnxEmbedder()
+    # Lightweight, fast, multilingual-capable
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=EMBEDDING_DEVICE)
+    if EMBEDDING_DEVICE == "cuda":
+        model.half()
+    else:
+        transformer = model[0]
+        transformer.auto_model = torch.quantization.quantize_dynamic(
+            transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+@lru_cache(maxsize=1)
+def get_chroma_client():
+    """Open the persistent ChromaDB client once; collections are per scope."""
+    return chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+
+
+@lru_cache(maxsize=1)
+def _embedding_cache_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(EMBEDDING_CACHE_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+    return conn
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.sha256(f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_PRECISION}\0{text.strip().lower()}".encode()).digest()
+
+
+def _cache_get(keys: List[bytes]) -> Dict[bytes, List[float]]:
+    found: Dict[bytes, List[float]] = {}
+    try:
+        with _embed_cache_lock:
+            conn = _embedding_cache_db()
+            for start in range(0, len(keys), _SQLITE_MAX_VARS):
+                part = keys[start:start + _SQLITE_MAX_VARS]
+                rows = conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({','.join('?' * len(part))})",
+                    part,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+    except sqlite3.Error as exc:
+        logger.warning(f"Embedding cache read failed: {exc}")
+    return found
+
+
+def _cache_put(items: Dict[bytes, List[float]]) -> None:
+    try:
+        with _embed_cache_lock:
+            conn = _embedding_cache_db()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)",
+                    [(key, np.asarray(vec, dtype=np.float16).tobytes()) for key, vec in items.items()],
+                )
+    except sqlite3.Error as exc:
+        logger.warning(f"Embedding cache write failed: {exc}")
+
+
+def _recall(keys: List[bytes]) -> Dict[bytes, List[float]]:
+    with _embed_cache_lock:
+        return {key: _embed_memo[key] for key in keys if key in _embed_memo}
+
+
+def _remember(items: Dict[bytes, List[float]]) -> None:
+    with _embed_cache_lock:
+        if len(_embed_memo) + len(items) > _EMBED_MEMO_MAX:
+            _embed_memo.clear()
+        _embed_memo.update(items)
+
+
+def encode_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Encode texts with the shared model; vectors are unit-normalized.
+    Texts seen before are served from the embedding cache, and only the
+    distinct misses go through the model, in one batch.
+    """
+    keys = [_text_key(text) for text in texts]
+    found = _recall(keys)
+
+    unseen = [key for key in dict.fromkeys(keys) if key not in found]
+    if unseen:
+        stored = _cache_get(unseen)
+        _remember(stored)
+        found.update(stored)
+
+    # One position per distinct key: repeated boilerplate chunks are encoded once
+    misses: Dict[bytes, int] = {}
+    for i, key in enumerate(keys):
+        if key not in found:
+            misses.setdefault(key, i)
+    if misses:
+        vectors = get_embedding_model().encode(
+            [texts[i] for i in misses.values()],
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).tolist()
+        computed = dict(zip(misses, vectors))
+        _cache_put(computed)
+        _remember(computed)
+        found.update(computed)
+
+    return [found[key] for key in keys]
+
+
+def warm_up() -> None:
+    """Load the embedding model, run one encode and open Chroma, so the first query is warm."""
+    # Straight to the model: a cache hit here would leave it unloaded
+    get_embedding_model().encode(["warmup"], convert_to_numpy=True, show_progress_bar=False)
+    _embedding_cache_db()
+    get_chroma_client()
+
+
+async def _embedding_worker(queue: asyncio.Queue) -> None:
+    batch: list = []
+    try:
+        while True:
+            batch = [await queue.get()]
+            # One yield so callers scheduled in the same tick join, then flush:
+            # a lone caller never waits, and callers arriving during an encode
+            # pile up in the queue for the next batch
+            await asyncio.sleep(0)
+            count = len(batch[0][0])
+            while count < _EMBED_BATCH_MAX and not queue.empty():
+                item = queue.get_nowait()
+                batch.append(item)
+                count += len(item[0])
+
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                vectors = await asyncio.to_thread(encode_texts, texts)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            offset = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+            batch = []
+    except asyncio.CancelledError:
+        for _, future in batch:
+            future.cancel()
+        raise
+
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embed texts, answering cached texts directly and sending only the misses
+    through the shared batching worker, so concurrent ingests and searches
+    are encoded together in one forward pass.
+    """
+    global _embed_loop, _embed_queue, _embed_task
+    if not texts:
+        return []
+    keys = [_text_key(text) for text in texts]
+    found = _recall(keys)
+    misses = {key: text for key, text in zip(keys, texts) if key not in found}
+    if misses:
+        loop = asyncio.get_running_loop()
+        if _embed_loop is not loop or _embed_task is None or _embed_task.done():
+            _embed_loop = loop
+            _embed_queue = asyncio.Queue()
+            _embed_task = loop.create_task(_embedding_worker(_embed_queue))
+        future = loop.create_future()
+        await _embed_queue.put((list(misses.values()), future))
+        found.update(zip(misses, await future))
+    return [found[key] for key in keys]
+
+
+async def stop_embedding_worker() -> None:
+    """Stop the batching worker and cancel callers still waiting (called from the app lifespan)."""
+    global _embed_loop, _embed_queue, _embed_task
+    if _embed_task is None or _embed_loop is not asyncio.get_running_loop():
+        return
+    queue, _embed_queue = _embed_queue, None
+    _embed_task.cancel()
+    try:
+        await _embed_task
+    except asyncio.CancelledError:
+        pass
+    _embed_loop = _embed_task = None
+
+    while not queue.empty():
+        _, future = queue.get_nowait()
+        future.cancel()
+
+
+class SearchHit(NamedTuple):
+    """One vector-search result; distance is 1 - cosine (None if the backend omits it)."""
+    id: Optional[str]
+    document: str
+    metadata: Optional[Dict[str, Any]]
+    distance: Optional[float]
+
+    @property
+    def source(self) -> str:
+        return self.metadata.get("source", "Unknown") if self.metadata else "Unknown"
+
+
+# Chroma adds at most this many records per call
+_CHROMA_ADD_BATCH = 5000
+
+
+def _get_collection_or_none(client, name: str):
+    try:
+        return client.get_collection(name)
+    except Exception:  # missing; the exception type varies across Chroma versions
+        return None
+
+
+def _open_ip_collection(client, name: str):
+    """
+    Get or create an inner-product collection. Embeddings are unit-normalized,
+    so "ip" ranks exactly like "cosine" without Chroma normalizing per query.
+    A legacy cosine collection is copied into "<name>__ip" with normalized
+    vectors, then swapped in under the original name.
+    """
+    staging = f"{name}__ip"
+    collection = _get_collection_or_none(client, name)
+    if collection is None:
+        staged = _get_collection_or_none(client, staging)
+        if staged is not None:
+            # A previous migration stopped after dropping the original
+            staged.modify(name=name)
+            return staged
+        return client.create_collection(name=name, metadata={"hnsw:space": "ip"})
+
+    if (collection.metadata or {}).get("hnsw:space") == "ip":
+        return collection
+
+    logger.info(f"Migrating vector collection {name} to inner-product space")
+    data = collection.get(include=["embeddings", "documents", "metadatas"])
+    if _get_collection_or_none(client, staging) is not None:
+        client.delete_collection(staging)
+    staged = client.create_collection(name=staging, metadata={"hnsw:space": "ip"})
+    if data["ids"]:
+        vectors = np.asarray(data["embeddings"], dtype=np.float32)
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        for start in range(0, len(data["ids"]), _CHROMA_ADD_BATCH):
+            end = start + _CHROMA_ADD_BATCH
+            staged.add(
+                ids=data["ids"][start:end],
+                embeddings=vectors[start:end].tolist(),
+                documents=data["documents"][start:end],
+                metadatas=data["metadatas"][start:end],
+            )
+    client.delete_collection(name)
+    staged.modify(name=name)
+    return staged
+
+
+class _QueryCache:
+    """
+    Ring buffer of recent unit-normalized query vectors and their results.
+    A lookup is one matrix-vector product over at most QUERY_CACHE_SIZE rows.
+    """
+
+    def __init__(self, size: int = QUERY_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Optional[tuple]] = [None] * self.size
+        self._next = 0
+
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        q = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        return q / norm if norm else q
+
+    def get(self, vector: List[float], key: tuple) -> Optional[List[SearchHit]]:
+        q = self._unit(vector)
+        now = time.monotonic()
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != q.shape[0]:
+                return None
+            scores = self._vectors @ q
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < QUERY_CACHE_THRESHOLD:
+                    break
+                entry = self._entries[i]
+                if entry is not None and entry[0] == key and now - entry[1] < QUERY_CACHE_TTL_SECONDS:
+                    return list(entry[2])
+        return None
+
+    def put(self, vector: List[float], key: tuple, results: List[SearchHit]) -> None:
+        q = self._unit(vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != q.shape[0]:
+                self._vectors = np.zeros((self.size, q.shape[0]), dtype=np.float32)
+                self._entries = [None] * self.size
+            # FIFO: overwrite the oldest slot
+            self._vectors[self._next] = q
+            self._entries[self._next] = (key, time.monotonic(), tuple(results))
+            self._next = (self._next + 1) % self.size
+
 
 class VectorStore:
     """
@@ -23,31 +443,30 @@ class VectorStore:
     def __init__(self, collection_name: str = "ivep_documents"):
         self.collection_name = collection_name
         
-        # Initialize embedding model (lightweight, fast, multilingual-capable)
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # Initialize ChromaDB with persistence
-        self.client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+        # Shared embedding model and ChromaDB client
+        self.embedding_model = get_embedding_model()
+        self.client = get_chroma_client()
         
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
-        )
+        # Get or create collection (inner product over unit vectors = cosine)
+        self.collection = _open_ip_collection(self.client, collection_name)
+
+        # Near-duplicate queries skip the ANN search; cleared on every write
+        self.query_cache = _QueryCache()
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding vector for a single text."""
-        return self.embedding_model.encode(text, convert_to_numpy=True).tolist()
+        return encode_texts([text])[0]
     
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts (batch processing)."""
-        return self.embedding_model.encode(texts, convert_to_numpy=True).tolist()
+        return encode_texts(texts)
     
     def add_documents(
         self,
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
     ) -> List[str]:
         """
         Add documents to the vector store.
@@ -56,6 +475,7 @@ class VectorStore:
             documents: List of text content to store
             metadatas: Optional metadata for each document
             ids: Optional custom IDs (auto-generated if not provided)
+            embeddings: Precomputed vectors (e.g. from embed_texts); encoded here if omitted
         
         Returns:
             List of document IDs
@@ -67,7 +487,8 @@ class VectorStore:
             metadatas = [{} for _ in documents]
         
         # Generate embeddings
-        embeddings = self.generate_embeddings(documents)
+        if embeddings is None:
+            embeddings = self.generate_embeddings(documents)
         
         # Add to ChromaDB
         self.collection.add(
@@ -76,6 +497,7 @@ class VectorStore:
             metadatas=metadatas,
             ids=ids
         )
+        self.query_cache.clear()
         
         return ids
     
@@ -83,8 +505,9 @@ class VectorStore:
         self,
         query: str,
         top_k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[SearchHit]:
         """
         Search for similar documents using semantic similarity.
         
@@ -92,11 +515,18 @@ class VectorStore:
             query: Search query text
             top_k: Number of results to return
             filter_metadata: Optional metadata filter
+            query_embedding: Precomputed query vector; encoded here if omitted
         
         Returns:
-            List of results with document, metadata, and similarity score
+            SearchHit per result, best first
         """
-        query_embedding = self.generate_embedding(query)
+        if query_embedding is None:
+            query_embedding = self.generate_embedding(query)
+
+        cache_key = (top_k, repr(filter_metadata))
+        cached = self.query_cache.get(query_embedding, cache_key)
+        if cached is not None:
+            return cached
         
         results = self.collection.query(
             query_embeddings=[query_embedding],
@@ -104,22 +534,26 @@ class VectorStore:
             where=filter_metadata
         )
         
-        # Format results
-        formatted_results = []
-        if results['documents'] and results['documents'][0]:
-            for i, doc in enumerate(results['documents'][0]):
-                formatted_results.append({
-                    "id": results['ids'][0][i] if results['ids'] else None,
-                    "document": doc,
-                    "metadata": results['metadatas'][0][i] if results['metadatas'] else {},
-                    "distance": results['distances'][0][i] if results['distances'] else None
-                })
+        # Zip Chroma's per-field columns straight into hits
+        formatted_results: List[SearchHit] = []
+        documents = results['documents'][0] if results['documents'] else []
+        if documents:
+            count = len(documents)
+            formatted_results = list(map(
+                SearchHit,
+                results['ids'][0] if results['ids'] else [None] * count,
+                documents,
+                results['metadatas'][0] if results['metadatas'] else [None] * count,
+                results['distances'][0] if results['distances'] else [None] * count,
+            ))
         
+        self.query_cache.put(query_embedding, cache_key, formatted_results)
         return formatted_results
     
     def delete(self, ids: List[str]) -> None:
         """Delete documents by their IDs."""
         self.collection.delete(ids=ids)
+        self.query_cache.clear()
     
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection."""
@@ -130,7 +564,7 @@ class VectorStore:
 
 
 # Singleton instances for different scopes
-_vector_stores: Dict[str, VectorStore] = {}
+_vector_stores: Dict[str, "VectorStore"] = {}
 
 
 def get_vector_store(scope: str = "platform") -> VectorStore:
@@ -145,6 +579,10 @@ def get_vector_store(scope: str = "platform") -> VectorStore:
     """
     if scope not in _vector_stores:
         collection_name = f"ivep_{scope}"
-        _vector_stores[scope] = VectorStore(collection_name=collection_name)
+        if settings.VECTOR_BACKEND == "faiss":
+            from .faiss_store import FaissVectorStore
+            _vector_stores[scope] = FaissVectorStore(collection_name=collection_name)
+        else:
+            _vector_stores[scope] = VectorStore(collection_name=collection_name)
     
     return _vector_stores[scope]
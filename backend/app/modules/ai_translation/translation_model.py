@@ -2,11 +2,25 @@
 MarianMT Translation Model Service.
 Uses HuggingFace Helsinki-NLP/opus-mt models for high-quality translation.
 """
-from typing import Dict, Optional, List
-from transformers import MarianMTModel, MarianTokenizer
+import os
+import shutil
+import threading
+from typing import Any, Dict, Optional, List, Tuple
+from transformers import GenerationConfig, MarianMTModel, MarianTokenizer
 import torch
 from functools import lru_cache
 
+try:
+    import ctranslate2
+except ImportError:  # optional: decode with transformers' generate instead
+    ctranslate2 = None
+
+# transformers path: texts per generate call, grouped by length to limit padding
+TRANSLATE_SUB_BATCH = 8
+
+# Converted CTranslate2 models, one directory per HuggingFace model
+CT2_MODELS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "ct2")
+
 
 # Map of supported language pairs to model names
 # Format: (source, target) -> model_name
@@ -69,6 +83,11 @@ class MarianTranslator:
         
         self._models: Dict[str, MarianMTModel] = {}
         self._tokenizers: Dict[str, MarianTokenizer] = {}
+        self._ct2_translators: Dict[str, Any] = {}
+        self._ct2_beams: Dict[str, int] = {}
+        # One lock per model: concurrent first requests must not convert it twice
+        self._ct2_locks: Dict[str, threading.Lock] = {}
+        self._ct2_locks_guard = threading.Lock()
     
     def _get_model_name(self, source_lang: str, target_lang: str) -> Optional[str]:
         """Get the model name for a language pair."""
@@ -91,19 +110,127 @@ class MarianTranslator:
         
         return None
     
+    def _load_tokenizer(self, model_name: str) -> MarianTokenizer:
+        """Load and cache a tokenizer."""
+        if model_name not in self._tokenizers:
+            self._tokenizers[model_name] = MarianTokenizer.from_pretrained(model_name)
+        return self._tokenizers[model_name]
+
+    def _load_ct2(self, model_name: str):
+        """
+        Load a CTranslate2 translator, converting the model to data/ct2 on first use.
+        Returns None when ctranslate2 is not installed or conversion fails.
+        """
+        if ctranslate2 is None:
+            return None
+        if model_name in self._ct2_translators:
+            return self._ct2_translators[model_name]
+        with self._ct2_locks_guard:
+            lock = self._ct2_locks.setdefault(model_name, threading.Lock())
+        with lock:
+            if model_name not in self._ct2_translators:
+                path = os.path.join(CT2_MODELS_DIR, model_name.replace("/", "--"))
+                try:
+                    if not os.path.isdir(path):
+                        self._convert_ct2(model_name, path)
+                    compute_type = "int8_float16" if self.device == "cuda" else "int8"
+                    # Decode with the model's own beam width (4 for opus-mt), as generate() does
+                    self._ct2_beams[model_name] = GenerationConfig.from_pretrained(model_name).num_beams or 1
+                    self._ct2_translators[model_name] = ctranslate2.Translator(
+                        path, device=self.device, compute_type=compute_type
+                    )
+                except Exception as e:
+                    print(f"CTranslate2 unavailable for {model_name}, using transformers: {e}")
+                    self._ct2_translators[model_name] = None
+        return self._ct2_translators[model_name]
+
+    @staticmethod
+    def _convert_ct2(model_name: str, path: str) -> None:
+        """Convert into a per-process temp dir, then move it into place."""
+        print(f"Converting translation model for CTranslate2: {model_name}")
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        ctranslate2.converters.TransformersConverter(model_name).convert(tmp_path, force=True)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another worker process finished the same conversion first
+            if not os.path.isdir(path):
+                raise
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
     def _load_model(self, model_name: str) -> tuple:
         """Load and cache a model and tokenizer."""
         if model_name not in self._models:
             print(f"Loading translation model: {model_name}")
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
+            tokenizer = self._load_tokenizer(model_name)
             model = MarianMTModel.from_pretrained(model_name)
             model.to(self.device)
             model.eval()
+            # FP16 on GPU, dynamic INT8 Linear layers on CPU
+            if self.device == "cuda":
+                model = model.half()
+            else:
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
             
-            self._tokenizers[model_name] = tokenizer
             self._models[model_name] = model
         
         return self._models[model_name], self._tokenizers[model_name]
+
+    def warmup(self, pairs: List[Tuple[str, str]]) -> None:
+        """
+        Load the models for the given (source, target) pairs ahead of the first
+        request, converting them for CTranslate2 here rather than on a request.
+        """
+        for source_lang, target_lang in pairs:
+            model_name = self._get_model_name(source_lang, target_lang)
+            if model_name is None:
+                continue
+            if self._load_ct2(model_name) is not None:
+                self._load_tokenizer(model_name)
+            else:
+                self._load_model(model_name)
+
+    def _generate(self, model_name: str, texts: List[str], max_length: int) -> List[str]:
+        """Translate a batch with CTranslate2 when available, else transformers' generate."""
+        ct2_translator = self._load_ct2(model_name)
+        if ct2_translator is not None:
+            tokenizer = self._load_tokenizer(model_name)
+            source = [
+                tokenizer.convert_ids_to_tokens(tokenizer.encode(t, truncation=True, max_length=max_length))
+                for t in texts
+            ]
+            results = ct2_translator.translate_batch(
+                source, max_decoding_length=max_length, beam_size=self._ct2_beams[model_name]
+            )
+            return [
+                tokenizer.decode(tokenizer.convert_tokens_to_ids(r.hypotheses[0]), skip_special_tokens=True)
+                for r in results
+            ]
+
+        model, tokenizer = self._load_model(model_name)
+        
+        # Longest first, in sub-batches, so short texts are not padded to the longest one
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        results: List[Optional[str]] = [None] * len(texts)
+        for start in range(0, len(order), TRANSLATE_SUB_BATCH):
+            indices = order[start:start + TRANSLATE_SUB_BATCH]
+            inputs = tokenizer(
+                [texts[i] for i in indices],
+                return_tensors="pt",
+                padding="longest",
+                truncation=True,
+                max_length=max_length,
+                pad_to_multiple_of=8 if self.device == "cuda" else None,
+            )
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            
+            with torch.inference_mode():
+                translated = model.generate(**inputs, max_length=max_length)
+            
+            for i, tokens in zip(indices, translated):
+                results[i] = tokenizer.decode(tokens, skip_special_tokens=True)
+        
+        return results
     
     def translate(
         self,
@@ -134,17 +261,7 @@ class MarianTranslator:
             # Try pivot translation through English
             return self._pivot_translate(text, source_lang, target_lang, max_length)
         
-        model, tokenizer = self._load_model(model_name)
-        
-        # Tokenize and translate
-        inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=max_length)
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        
-        with torch.no_grad():
-            translated = model.generate(**inputs, max_length=max_length)
-        
-        result = tokenizer.decode(translated[0], skip_special_tokens=True)
-        return result
+        return self._generate(model_name, [text], max_length)[0]
     
     def _pivot_translate(
         self,
@@ -182,22 +299,18 @@ class MarianTranslator:
         if source_lang.lower() == target_lang.lower():
             return texts
         
+        # Repeated strings (labels, boilerplate) are translated once
+        unique = list(dict.fromkeys(texts))
         model_name = self._get_model_name(source_lang, target_lang)
         
         if model_name is None:
             # Fall back to individual translations with pivot
-            return [self._pivot_translate(t, source_lang, target_lang, max_length) for t in texts]
-        
-        model, tokenizer = self._load_model(model_name)
-        
-        inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=max_length)
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        
-        with torch.no_grad():
-            translated = model.generate(**inputs, max_length=max_length)
+            translated = [self._pivot_translate(t, source_lang, target_lang, max_length) for t in unique]
+        else:
+            translated = self._generate(model_name, unique, max_length)
         
-        results = [tokenizer.decode(t, skip_special_tokens=True) for t in translated]
-        return results
+        by_text = dict(zip(unique, translated))
+        return [by_text[t] for t in texts]
     
     def get_supported_pairs(self) -> List[tuple]:
         """Get list of directly supported language pairs."""
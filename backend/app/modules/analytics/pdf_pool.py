@@ -0,0 +1,42 @@
+"""
+Process pool for report PDF compilation.
+Kept free of xhtml2pdf/Jinja imports so the app lifespan can shut it down cheaply.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# xhtml2pdf is pure Python, so concurrent exports only run in parallel in
+# separate processes; single-core hosts compile on a thread instead
+PDF_COMPILE_WORKERS = min(os.cpu_count() or 1, 4)
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared compile pool, started on first use; None when it would not help."""
+    global _pdf_pool
+    if PDF_COMPILE_WORKERS < 2:
+        return None
+    if _pdf_pool is None:
+        # spawn: forking a process that runs an event loop and driver threads is unsafe
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_COMPILE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+
+def reset_pdf_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died (BrokenProcessPool); the next export starts a new one."""
+    global _pdf_pool
+    if _pdf_pool is broken:
+        _pdf_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the PDF compile workers, if any were started."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
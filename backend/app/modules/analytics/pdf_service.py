@@ -1,14 +1,85 @@
+import asyncio
 import os
+import hashlib
+import json
 import logging
 import io
+import time
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from xhtml2pdf import pisa
 
+from app.core.config import settings
+
+from .pdf_pool import get_pdf_pool, reset_pdf_pool
+
 logger = logging.getLogger(__name__)
 
+# Compiled template bytecode survives restarts, so cold workers skip the Jinja parse
+JINJA_BYTECODE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "jinja_cache")
+
+# Rendered PDFs for identical report data (repeat/double-clicked exports):
+# key -> (expires_at, generated_at the PDF was rendered with, pdf bytes).
+# A hit within the TTL shows the original build time, which is still correct
+# for the same numbers.
+PDF_CACHE_TTL_SECONDS = 300.0
+_PDF_CACHE_MAX_ENTRIES = 32
+_pdf_cache: dict[bytes, tuple[float, Any, bytes]] = {}
+
+
+def _report_key(data: dict, template_name: str) -> bytes:
+    """Stable digest of the report data; generated_at is left out, every export stamps a new one."""
+    content = {k: v for k, v in data.items() if k != "generated_at"}
+    raw = json.dumps([template_name, content], sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+def _get_cached_pdf(key: bytes) -> Optional[tuple[Any, bytes]]:
+    entry = _pdf_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1], entry[2]
+    return None
+
+
+def _cache_pdf(key: bytes, generated_at: Any, pdf: bytes) -> None:
+    if len(_pdf_cache) >= _PDF_CACHE_MAX_ENTRIES:
+        _pdf_cache.clear()
+    _pdf_cache[key] = (time.monotonic() + PDF_CACHE_TTL_SECONDS, generated_at, pdf)
+
+
+def _compile_html(html_content: str) -> Optional[bytes]:
+    """Compile HTML to PDF using xhtml2pdf (module-level so pool workers can run it)."""
+    result = io.BytesIO()
+    try:
+        pisa_status = pisa.CreatePDF(
+            io.StringIO(html_content),
+            dest=result,
+            encoding='utf-8'
+        )
+        if pisa_status.err:
+            logger.error(f"xhtml2pdf error: {pisa_status.err}")
+            return None
+        return result.getvalue()
+    except Exception as e:
+        logger.error(f"PDF compilation failed: {e}")
+        return None
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """The on-disk bytecode cache, or None when its directory cannot be written."""
+    try:
+        os.makedirs(JINJA_BYTECODE_DIR, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Jinja bytecode cache disabled: {e}")
+        return None
+    if not os.access(JINJA_BYTECODE_DIR, os.W_OK):
+        logger.warning(f"Jinja bytecode cache disabled: {JINJA_BYTECODE_DIR} is not writable")
+        return None
+    return FileSystemBytecodeCache(JINJA_BYTECODE_DIR)
+
 
 def _money_mad(amount: float) -> str:
     return f"{float(amount):,.2f} MAD".replace(",", " ")
@@ -17,17 +88,25 @@ def _money_mad(amount: float) -> str:
 class PDFService:
     def __init__(self, templates_dir: str):
         self.templates_dir = templates_dir
+        # Templates are compiled once and kept in the environment's cache; outside
+        # dev, skip the per-render mtime check since they only change on deploy
         self.jinja_env = Environment(
             loader=FileSystemLoader(templates_dir),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            auto_reload=settings.ENV == "dev",
+            bytecode_cache=_bytecode_cache(),
         )
         # Add filters if needed
         self.jinja_env.filters['money_mad'] = _money_mad
 
-    def generate_html(self, data: dict, template_name: str = "admin_platform_report") -> str:
-        """Render HTML from data using a specific template."""
+    @staticmethod
+    def _stamp(data: dict) -> None:
         if "generated_at" not in data:
             data["generated_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    def generate_html(self, data: dict, template_name: str = "admin_platform_report") -> str:
+        """Render HTML from data using a specific template."""
+        self._stamp(data)
         
         # Ensure we have a .html extension
         if not template_name.endswith(".html"):
@@ -45,30 +124,24 @@ class PDFService:
 
     def compile_pdf(self, html_content: str) -> bytes:
         """Compile HTML to PDF using xhtml2pdf."""
-        result = io.BytesIO()
-        try:
-            pisa_status = pisa.CreatePDF(
-                io.StringIO(html_content),
-                dest=result,
-                encoding='utf-8'
-            )
-            if pisa_status.err:
-                logger.error(f"xhtml2pdf error: {pisa_status.err}")
-                return None
-            return result.getvalue()
-        except Exception as e:
-            logger.error(f"PDF compilation failed: {e}")
-            return None
+        return _compile_html(html_content)
+
+    def _build_pdf(
+        self, data: dict, template_name: str, compile_html: Callable[[str], Optional[bytes]]
+    ) -> Optional[bytes]:
+        """Serve from the PDF cache, else render the template and compile it with compile_html."""
+        key = _report_key(data, template_name)
+        cached = _get_cached_pdf(key)
+        if cached is not None:
+            # Report the build time the cached PDF actually prints
+            data["generated_at"], pdf = cached
+            return pdf
 
-    def generate_report_pdf(self, data: dict, template_name: str = "admin_platform_report") -> bytes:
-        """
-        Main entry point for PDF generation.
-        Renamed from generate_report_pdf for compatibility but now uses HTML.
-        """
         try:
             html = self.generate_html(data, template_name)
-            pdf = self.compile_pdf(html)
+            pdf = compile_html(html)
             if pdf:
+                _cache_pdf(key, data["generated_at"], pdf)
                 return pdf
             
             # If xhtml2pdf fails, we could fall back to ReportLab but let's try to fix HTML first
@@ -78,6 +151,32 @@ class PDFService:
             logger.error(f"Final PDF generation failure: {e}")
             return None
 
+    def generate_report_pdf(self, data: dict, template_name: str = "admin_platform_report") -> bytes:
+        """
+        Main entry point for PDF generation.
+        Renamed from generate_report_pdf for compatibility but now uses HTML.
+        """
+        return self._build_pdf(data, template_name, self.compile_pdf)
+
+    async def generate_report_pdf_async(self, data: dict, template_name: str = "admin_platform_report") -> bytes:
+        """
+        Compile off the event loop: in the process pool, so concurrent exports
+        use separate cores, or in a worker thread on single-core hosts.
+        """
+        pool = get_pdf_pool()
+        if pool is None:
+            compile_html = self.compile_pdf
+        else:
+            def compile_html(html: str) -> Optional[bytes]:
+                try:
+                    return pool.submit(_compile_html, html).result()
+                except BrokenProcessPool:
+                    # A worker died (OOM, crash): replace the pool, compile this one here
+                    logger.warning("PDF compile pool broke; restarting it")
+                    reset_pdf_pool(pool)
+                    return self.compile_pdf(html)
+        return await asyncio.to_thread(self._build_pdf, data, template_name, compile_html)
+
 # Instantiate as 'latex_service' for backward compatibility with router.py imports
 pdf_service = PDFService(os.path.join(os.path.dirname(__file__), "templates"))
 latex_service = pdf_service 
@@ -1,6 +1,8 @@
 """
 Analytics repository — real MongoDB aggregations for IVEP.
 """
+import asyncio
+
 from ...db.mongo import get_database
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
@@ -19,6 +21,15 @@ def _date_range_chart(days: int = 30) -> list[dict]:
     ]
 
 
+def _daily_chart(start: datetime, days: int, counts: dict[str, int]) -> list[dict]:
+    """One point per day from start, valued from counts keyed by YYYY-MM-DD."""
+    first = start.date()
+    return [
+        {"timestamp": f"{day}T00:00:00Z", "value": counts.get(day, 0)}
+        for day in ((first + timedelta(days=i)).isoformat() for i in range(days))
+    ]
+
+
 class AnalyticsRepository:
     @property
     def db(self):
@@ -29,14 +40,6 @@ class AnalyticsRepository:
     async def get_platform_metrics(self) -> Dict[str, Any]:
         db = self.db
 
-        # KPI counts
-        total_users = await db["users"].count_documents({})
-        active_events = await db["events"].count_documents({"state": "live"})
-        total_events = await db["events"].count_documents({})
-        total_stands = await db["stands"].count_documents({})
-        total_orgs = await db["organizations"].count_documents({})
-        pending_events = await db["events"].count_documents({"state": "pending_approval"})
-
         # 30-day event creation trend (real)
         now = datetime.now(timezone.utc)
         thirty_ago = now - timedelta(days=30)
@@ -53,35 +56,50 @@ class AnalyticsRepository:
             },
             {"$sort": {"_id": 1}},
         ]
-        trend_docs = await db["events"].aggregate(pipeline_trend).to_list(length=100)
-        trend_map = {d["_id"]: d["count"] for d in trend_docs}
 
-        main_chart = [
+        # Every events-derived figure in one pass: per-state counts (live,
+        # pending, total), the trend, the category distribution and
+        # the most recent events
+        pipeline_events = [
             {
-                "timestamp": (thirty_ago + timedelta(days=i)).strftime("%Y-%m-%d") + "T00:00:00Z",
-                "value": trend_map.get(
-                    (thirty_ago + timedelta(days=i)).strftime("%Y-%m-%d"), 0
-                ),
-            }
-            for i in range(31)
+                "$facet": {
+                    "states": [{"$group": {"_id": "$state", "count": {"$sum": 1}}}],
+                    "trend": pipeline_trend,
+                    "distribution": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}],
+                    "recent": [
+                        {"$sort": {"created_at": -1}},
+                        {"$limit": 10},
+                        {"$project": {"title": 1, "state": 1, "created_at": 1, "organizer_name": 1}},
+                    ],
+                }
+            },
         ]
 
-        # Event category distribution
-        pipeline_dist = [
-            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
-        ]
-        dist_docs = await db["events"].aggregate(pipeline_dist).to_list(length=50)
+        # The events facet and the other collections' counts run concurrently
+        events_facet, total_users, total_stands, total_orgs = await asyncio.gather(
+            db["events"].aggregate(pipeline_events).to_list(length=1),
+            db["users"].count_documents({}),
+            db["stands"].count_documents({}),
+            db["organizations"].count_documents({}),
+        )
+        facet = events_facet[0] if events_facet else {}
+        state_counts = {d["_id"]: d["count"] for d in facet.get("states", [])}
+        active_events = state_counts.get("live", 0)
+        pending_events = state_counts.get("pending_approval", 0)
+        total_events = sum(state_counts.values())
+        trend_docs = facet.get("trend", [])
+        dist_docs = facet.get("distribution", [])
+        recent_docs = facet.get("recent", [])
+        trend_map = {d["_id"]: d["count"] for d in trend_docs}
+
+        main_chart = _daily_chart(thirty_ago, 31, trend_map)
+
         distribution = {d["_id"] or "Uncategorized": float(d["count"]) for d in dist_docs}
         if not distribution:
             distribution = {"No Events": 1.0}
 
-        # Recent event activity
-        recent_cursor = db["events"].find(
-            {},
-            {"title": 1, "state": 1, "created_at": 1, "organizer_name": 1},
-        ).sort("created_at", -1).limit(10)
         recent_events = []
-        async for doc in recent_cursor:
+        for doc in recent_docs:
             recent_events.append({
                 "id": str(doc.get("_id", "")),
                 "title": doc.get("title", ""),
@@ -109,23 +127,6 @@ class AnalyticsRepository:
     async def get_event_analytics(self, event_id: str) -> Dict[str, Any]:
         db = self.db
 
-        # Count participants for this event
-        participants = await db["participants"].count_documents({"event_id": event_id})
-        stands = await db["stands"].count_documents({"event_id": event_id})
-        leads = await db["leads"].count_documents({"event_id": event_id})
-        chats = await db["chat_rooms"].count_documents({"event_id": event_id})
-
-        # Analytics events for this event (from analytics_events collection)
-        visits = await db["analytics_events"].count_documents(
-            {"event_id": event_id, "type": "event_view"}
-        )
-        stand_visits = await db["analytics_events"].count_documents(
-            {"event_id": event_id, "type": "stand_visit"}
-        )
-        chats_opened = await db["analytics_events"].count_documents(
-            {"event_id": event_id, "type": "chat_opened"}
-        )
-
         # Trend over last 14 days
         now = datetime.now(timezone.utc)
         fourteen_ago = now - timedelta(days=14)
@@ -141,20 +142,35 @@ class AnalyticsRepository:
             },
             {"$sort": {"_id": 1}},
         ]
-        trend_docs = await db["analytics_events"].aggregate(pipeline_trend).to_list(length=50)
+
+        (
+            # Count participants for this event
+            participants,
+            stands,
+            leads,
+            chats,
+            # Analytics events for this event (from analytics_events collection)
+            visits,
+            stand_visits,
+            chats_opened,
+            trend_docs,
+            stand_org_ids,
+        ) = await asyncio.gather(
+            db["participants"].count_documents({"event_id": event_id}),
+            db["stands"].count_documents({"event_id": event_id}),
+            db["leads"].count_documents({"event_id": event_id}),
+            db["chat_rooms"].count_documents({"event_id": event_id}),
+            db["analytics_events"].count_documents({"event_id": event_id, "type": "event_view"}),
+            db["analytics_events"].count_documents({"event_id": event_id, "type": "stand_visit"}),
+            db["analytics_events"].count_documents({"event_id": event_id, "type": "chat_opened"}),
+            db["analytics_events"].aggregate(pipeline_trend).to_list(length=50),
+            # Participating enterprises
+            db["stands"].distinct("organization_id", {"event_id": event_id}),
+        )
         trend_map = {d["_id"]: d["count"] for d in trend_docs}
-        main_chart = [
-            {
-                "timestamp": (fourteen_ago + timedelta(days=i)).strftime("%Y-%m-%d") + "T00:00:00Z",
-                "value": trend_map.get(
-                    (fourteen_ago + timedelta(days=i)).strftime("%Y-%m-%d"), 0
-                ),
-            }
-            for i in range(15)
-        ]
+        main_chart = _daily_chart(fourteen_ago, 15, trend_map)
 
         # Fetch participating enterprises
-        stand_org_ids = await db["stands"].distinct("organization_id", {"event_id": event_id})
         enterprises = []
         if stand_org_ids:
             from bson import ObjectId
@@ -242,13 +258,7 @@ class AnalyticsRepository:
         trend_docs = await db["analytics_events"].aggregate(pipeline_trend).to_list(length=100)
         trend_map = {d["_id"]: d["count"] for d in trend_docs}
         
-        main_chart = [
-            {
-                "timestamp": (start_date + timedelta(days=i)).strftime("%Y-%m-%d") + "T00:00:00Z",
-                "value": trend_map.get((start_date + timedelta(days=i)).strftime("%Y-%m-%d"), 0)
-            }
-            for i in range(days + 1)
-        ]
+        main_chart = _daily_chart(start_date, days + 1, trend_map)
 
         # 2b. Pulse Chart (Hourly for last 24h)
         pipeline_pulse = [
@@ -125,7 +125,7 @@ async def export_platform_report(
 ):
     """Export platform-wide analysis report (Admin only)."""
     report = await build_admin_platform_report()
-    return _render_report_export(
+    return await _render_report_export(
         report=report,
         format=format,
         template_name="admin_platform_report",
@@ -214,7 +214,7 @@ def _report_to_csv_bytes(report: dict[str, Any]) -> bytes:
     return buffer.getvalue().encode("utf-8-sig")
 
 
-def _render_report_export(
+async def _render_report_export(
     report: dict[str, Any],
     format: str,
     template_name: str,
@@ -242,13 +242,15 @@ def _render_report_export(
             headers={"Content-Disposition": f'attachment; filename="{filename_base}.html"'},
         )
 
-    pdf_bytes = latex_service.generate_report_pdf(latex_data, template_name=template_name)
+    pdf_bytes = await latex_service.generate_report_pdf_async(latex_data, template_name=template_name)
     if pdf_bytes is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="PDF generation failed. Please consult server logs."
         )
 
+    # Buffered: the PDF is already one in-memory buffer, and repeat exports of the
+    # same data (with a new generated_at) are served from pdf_service's TTL cache
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
@@ -265,7 +267,7 @@ async def get_admin_platform_report(
     report = await build_admin_platform_report()
     if format == "json":
         return report
-    return _render_report_export(
+    return await _render_report_export(
         report=report,
         format=format,
         template_name="admin_platform_report",
@@ -290,7 +292,7 @@ async def get_organizer_event_report(
     
     # Use slug in filename
     filename_slug = report.get("event_slug") or event_id
-    return _render_report_export(
+    return await _render_report_export(
         report=report,
         format=format,
         template_name="organizer_event_report",
@@ -307,7 +309,7 @@ async def get_organizer_overall_report(
     report = await build_organizer_overall_report(str(current_user["_id"]))
     if format == "json":
         return report
-    return _render_report_export(
+    return await _render_report_export(
         report=report,
         format=format,
         template_name="organizer_overall_report",
@@ -328,7 +330,7 @@ async def get_enterprise_event_report(
         return report
     
     filename_slug = report.get("event_slug") or event_id
-    return _render_report_export(
+    return await _render_report_export(
         report=report,
         format=format,
         template_name="report",
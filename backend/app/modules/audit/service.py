@@ -1,12 +1,23 @@
 """
 Audit log service — log_audit helper + query support.
 """
+import asyncio
+import logging
 from datetime import datetime, timezone
 from typing import Optional, Any, Dict
 from bson import ObjectId
 
 from ...db.mongo import get_database
 
+logger = logging.getLogger(__name__)
+
+# Background writer for queue_audit(): batches records into insert_many
+_AUDIT_QUEUE_MAX = 10_000
+_AUDIT_BATCH_MAX = 200
+_AUDIT_FLUSH_SECONDS = 0.5
+_audit_queue: Optional[asyncio.Queue] = None
+_audit_task: Optional[asyncio.Task] = None
+
 
 def _normalize(doc: dict) -> dict:
     doc["id"] = str(doc.pop("_id", ""))
@@ -16,16 +27,14 @@ def _normalize(doc: dict) -> dict:
     return doc
 
 
-async def log_audit(
+def _build_record(
     actor_id: str,
     action: str,
     entity: str,
-    entity_id: Optional[str] = None,
-    metadata: Optional[Dict[str, Any]] = None,
+    entity_id: Optional[str],
+    metadata: Optional[Dict[str, Any]],
 ) -> dict:
-    """Insert an audit log entry into the audit_logs collection."""
-    db = get_database()
-    record = {
+    return {
         "actor_id": actor_id,
         "action": action,
         "entity": entity,
@@ -33,11 +42,102 @@ async def log_audit(
         "timestamp": datetime.now(timezone.utc),
         "metadata": metadata or {},
     }
+
+
+async def log_audit(
+    actor_id: str,
+    action: str,
+    entity: str,
+    entity_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> dict:
+    """Insert an audit log entry into the audit_logs collection."""
+    db = get_database()
+    record = _build_record(actor_id, action, entity, entity_id, metadata)
     result = await db["audit_logs"].insert_one(record)
     record["_id"] = result.inserted_id
     return _normalize(record)
 
 
+async def queue_audit(
+    actor_id: str,
+    action: str,
+    entity: str,
+    entity_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Record an audit entry without waiting for the write.
+    Falls back to an inline insert when the writer is not running or the
+    queue is full, so entries are never dropped.
+    """
+    if _audit_queue is not None:
+        try:
+            _audit_queue.put_nowait(_build_record(actor_id, action, entity, entity_id, metadata))
+            return
+        except asyncio.QueueFull:
+            pass
+    await log_audit(actor_id, action, entity, entity_id=entity_id, metadata=metadata)
+
+
+async def _flush_audit(batch: list[dict]) -> None:
+    try:
+        await get_database()["audit_logs"].insert_many(batch, ordered=False)
+    except Exception as exc:
+        logger.error(f"Failed to write {len(batch)} audit log entries: {exc}")
+
+
+async def _audit_writer(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    batch: list[dict] = []
+    try:
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + _AUDIT_FLUSH_SECONDS
+            while len(batch) < _AUDIT_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            pending, batch = batch, []
+            # Shielded so a shutdown mid-write does not lose the batch
+            await asyncio.shield(_flush_audit(pending))
+    except asyncio.CancelledError:
+        if batch:
+            await _flush_audit(batch)
+        raise
+
+
+def start_audit_writer() -> None:
+    """Start the background audit writer (called from the app lifespan)."""
+    global _audit_queue, _audit_task
+    _audit_queue = asyncio.Queue(maxsize=_AUDIT_QUEUE_MAX)
+    _audit_task = asyncio.create_task(_audit_writer(_audit_queue))
+
+
+async def stop_audit_writer() -> None:
+    """Stop the writer after flushing queued entries."""
+    global _audit_queue, _audit_task
+    if _audit_task is None:
+        return
+    queue, _audit_queue = _audit_queue, None
+    _audit_task.cancel()
+    try:
+        await _audit_task
+    except asyncio.CancelledError:
+        pass
+    _audit_task = None
+
+    leftover = []
+    while not queue.empty():
+        leftover.append(queue.get_nowait())
+    if leftover:
+        await _flush_audit(leftover)
+
+
 async def list_audit_logs(
     actor_id: Optional[str] = None,
     action: Optional[str] = None,
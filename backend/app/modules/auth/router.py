@@ -11,7 +11,7 @@ from app.core.dependencies import get_current_user, require_role
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    verify_password,
+    verify_password_async,
     verify_token_type,
 )
 from app.modules.users.service import get_user_by_email, create_user, get_user_by_id, delete_user
@@ -40,7 +40,7 @@ async def login(request: LoginRequest) -> TokenResponse:
             detail="No account found with this email.",
         )
     
-    if not verify_password(request.password, user["hashed_password"]):
+    if not await verify_password_async(request.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password.",
@@ -96,7 +96,7 @@ async def register(request: RegisterRequest) -> RegisterResponse:
         )
     
     # Create new user — let MongoDB generate _id
-    from app.core.security import hash_password
+    from app.core.security import hash_password_async
     
     is_organizer = request.role == Role.ORGANIZER
     is_enterprise = request.role == Role.ENTERPRISE
@@ -105,7 +105,7 @@ async def register(request: RegisterRequest) -> RegisterResponse:
         "email": request.email,
         "username": request.username,
         "full_name": request.full_name,
-        "hashed_password": hash_password(request.password),
+        "hashed_password": await hash_password_async(request.password),
         "role": request.role,
         # Organizers and enterprises start as pending until admin approves
         "is_active": not needs_approval,
@@ -23,6 +23,28 @@ logger = logging.getLogger(__name__)
 # Daily.co REST API base URL
 _DAILY_BASE = "https://api.daily.co/v1"
 
+# Shared client so room/token calls reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared Daily REST client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared Daily REST client (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 def _get_headers() -> dict:
     """Build auth headers for Daily REST requests."""
@@ -81,31 +103,31 @@ async def create_room(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                f"{_DAILY_BASE}/rooms",
-                headers=_get_headers(),
-                json=payload,
-            )
-            if resp.status_code == 200:
-                logger.info("Daily room already exists: %s", room_name)
-                return True
-            if resp.status_code == 201:
-                logger.info("Daily room created: %s", room_name)
+        client = _get_client()
+        resp = await client.post(
+            f"{_DAILY_BASE}/rooms",
+            headers=_get_headers(),
+            json=payload,
+        )
+        if resp.status_code == 200:
+            logger.info("Daily room already exists: %s", room_name)
+            return True
+        if resp.status_code == 201:
+            logger.info("Daily room created: %s", room_name)
+            return True
+        # 400 Bad Request often means room already exists
+        if resp.status_code == 400:
+            detail = resp.json().get("info", "")
+            if "already exists" in detail.lower():
+                logger.info("Daily room already exists (confirmed): %s", room_name)
                 return True
-            # 400 Bad Request often means room already exists
-            if resp.status_code == 400:
-                detail = resp.json().get("info", "")
-                if "already exists" in detail.lower():
-                    logger.info("Daily room already exists (confirmed): %s", room_name)
-                    return True
-            logger.error(
-                "Daily create_room(%s) failed: %s %s",
-                room_name,
-                resp.status_code,
-                resp.text[:300],
-            )
-            return False
+        logger.error(
+            "Daily create_room(%s) failed: %s %s",
+            room_name,
+            resp.status_code,
+            resp.text[:300],
+        )
+        return False
     except Exception as exc:
         logger.error("Daily create_room(%s) exception: %s", room_name, exc)
         return False
@@ -122,24 +144,24 @@ async def delete_room(room_name: str) -> bool:
         return True
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.delete(
-                f"{_DAILY_BASE}/rooms/{room_name}",
-                headers=_get_headers(),
-            )
-            if resp.status_code in (200, 204):
-                logger.info("Daily room deleted: %s", room_name)
-                return True
-            if resp.status_code == 404:
-                logger.info("Daily room not found (already deleted): %s", room_name)
-                return True
-            logger.error(
-                "Daily delete_room(%s) failed: %s %s",
-                room_name,
-                resp.status_code,
-                resp.text[:300],
-            )
-            return False
+        client = _get_client()
+        resp = await client.delete(
+            f"{_DAILY_BASE}/rooms/{room_name}",
+            headers=_get_headers(),
+        )
+        if resp.status_code in (200, 204):
+            logger.info("Daily room deleted: %s", room_name)
+            return True
+        if resp.status_code == 404:
+            logger.info("Daily room not found (already deleted): %s", room_name)
+            return True
+        logger.error(
+            "Daily delete_room(%s) failed: %s %s",
+            room_name,
+            resp.status_code,
+            resp.text[:300],
+        )
+        return False
     except Exception as exc:
         logger.error("Daily delete_room(%s) exception: %s", room_name, exc)
         return False
@@ -195,24 +217,24 @@ async def _create_meeting_token(
         payload["properties"].pop("nbf")
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                f"{_DAILY_BASE}/meeting-tokens",
-                headers=_get_headers(),
-                json=payload,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            token = data.get("token")
-            if not token:
-                raise ValueError(f"Daily API returned no token: {data}")
-            logger.info(
-                "Daily token issued — room=%s user=%s owner=%s",
-                room_name,
-                user_id,
-                is_owner,
-            )
-            return token
+        client = _get_client()
+        resp = await client.post(
+            f"{_DAILY_BASE}/meeting-tokens",
+            headers=_get_headers(),
+            json=payload,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        token = data.get("token")
+        if not token:
+            raise ValueError(f"Daily API returned no token: {data}")
+        logger.info(
+            "Daily token issued — room=%s user=%s owner=%s",
+            room_name,
+            user_id,
+            is_owner,
+        )
+        return token
     except Exception as exc:
         logger.error(
             "Daily _create_meeting_token(%s, %s) failed: %s",
@@ -179,6 +179,18 @@ async def list_events(
     return stringify_object_ids(events)
 
 
+async def count_events(organizer_id, limit: Optional[int] = None) -> int:
+    """
+    Count an organizer's events without materializing them.
+
+    When ``limit`` is given the server stops counting once it is reached,
+    which is all a quota check needs.
+    """
+    collection = get_events_collection()
+    kwargs = {"limit": limit} if limit else {}
+    return await collection.count_documents({"organizer_id": str(organizer_id)}, **kwargs)
+
+
 async def update_event(event_id, data: EventUpdate) -> Optional[dict]:
     """
     Update an event's fields.
@@ -132,6 +132,19 @@ async def resolve_organization_id(identifier: str) -> str:
     return identifier
 
 
+async def get_organization_id_by_owner(owner_id) -> Optional[str]:
+    """
+    Return the _id string of the organization owned by a user, or None.
+
+    Single indexed lookup on owner_id (stored as string, ObjectId on legacy docs).
+    """
+    collection = get_organizations_collection()
+    s = str(owner_id)
+    query = {"owner_id": {"$in": [s, ObjectId(s)]}} if ObjectId.is_valid(s) else {"owner_id": s}
+    doc = await collection.find_one(query, {"_id": 1})
+    return str(doc["_id"]) if doc else None
+
+
 async def list_organizations() -> list[dict]:
     """
     List all organizations.
@@ -278,7 +278,7 @@ async def organizer_event_report(
         )
 
     try:
-        pdf_bytes = latex_service.generate_report_pdf(data, template_name="organizer_event_report")
+        pdf_bytes = await latex_service.generate_report_pdf_async(data, template_name="organizer_event_report")
         if not pdf_bytes:
             raise ValueError("PDF generation returned empty content")
 
@@ -324,7 +324,7 @@ async def organizer_summary_pdf(
             f"Administrative export for {admin_label}. Metrics align with the organizer-facing dossier; "
             "use for governance, finance checks, and audit trails."
         )
-        pdf_bytes = latex_service.generate_report_pdf(data, template_name="organizer_event_report")
+        pdf_bytes = await latex_service.generate_report_pdf_async(data, template_name="organizer_event_report")
 
         filename = f"organizer_report_{event_slug}_{datetime.now(timezone.utc).strftime('%Y%m%d')}.pdf"
         return Response(
@@ -394,7 +394,7 @@ async def organizer_overall_summary_pdf(
         }
 
         from app.modules.analytics.pdf_service import latex_service
-        pdf_bytes = latex_service.generate_report_pdf(data, template_name="organizer_overall_report")
+        pdf_bytes = await latex_service.generate_report_pdf_async(data, template_name="organizer_overall_report")
         if not pdf_bytes:
             raise ValueError("PDF generation returned empty content or failed to compile.")
         
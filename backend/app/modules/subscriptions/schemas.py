@@ -5,7 +5,7 @@ Defines data models for subscription plans and feature access.
 """
 
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -58,3 +58,16 @@ PLAN_FEATURES: dict[SubscriptionPlan, dict] = {
         "priority_support": True,
     },
 }
+
+
+# Flat (plan, feature) -> value table, built once at import for the authz hot path
+PLAN_FEATURE_MATRIX: dict[tuple[SubscriptionPlan, str], Any] = {
+    (plan, feature): value
+    for plan, features in PLAN_FEATURES.items()
+    for feature, value in features.items()
+}
+
+
+def get_plan_feature(plan: SubscriptionPlan, feature_name: str, default: Any = False) -> Any:
+    """Return a plan's value for a feature with a single dict lookup."""
+    return PLAN_FEATURE_MATRIX.get((plan, feature_name), default)
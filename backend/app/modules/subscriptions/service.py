@@ -7,7 +7,7 @@ Provides in-memory subscription storage and feature access checks.
 from typing import Optional
 from uuid import UUID
 
-from app.modules.subscriptions.schemas import PLAN_FEATURES, SubscriptionPlan
+from app.modules.subscriptions.schemas import SubscriptionPlan, get_plan_feature
 
 
 # In-memory subscription store: organization_id -> plan
@@ -54,10 +54,7 @@ def check_feature_access(organization_id: UUID, feature_name: str) -> bool:
     Returns:
         bool: True if allowed, False otherwise.
     """
-    plan = get_plan(organization_id)
-    features = PLAN_FEATURES.get(plan, {})
-    
-    val = features.get(feature_name)
+    val = get_plan_feature(get_plan(organization_id), feature_name, None)
     
     # Boolean feature
     if isinstance(val, bool):
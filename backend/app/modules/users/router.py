@@ -165,7 +165,7 @@ async def admin_create_user(
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid role: {payload.role}")
 
-    from app.core.security import hash_password
+    from app.core.security import hash_password_async
     from datetime import datetime, timezone
     
     # Check if user already exists
@@ -176,7 +176,7 @@ async def admin_create_user(
         )
     
     user_data = payload.model_dump()
-    user_data["hashed_password"] = hash_password(user_data.pop("password"))
+    user_data["hashed_password"] = await hash_password_async(user_data.pop("password"))
     user_data["created_at"] = datetime.now(timezone.utc)
     
     # Default behavior for admin-created users
@@ -1,3 +1,5 @@
+import time
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 from bson import ObjectId
@@ -6,10 +8,29 @@ from pymongo import ReturnDocument
 from app.db.mongo import get_database
 from app.modules.users.schemas import UserCreate
 from app.modules.auth.enums import Role
-from app.db.utils import stringify_object_ids
-from app.core.security import verify_password, hash_password
+from app.db.utils import ID_AS_STRING_STAGE, stringify_object_ids
+from app.core.security import verify_password_async, hash_password_async
 import re
 
+# Short-lived cache for the per-request auth lookup: user_id -> (expires_at, user).
+# It is per process: invalidate_user only clears this worker's copy, so other
+# workers can serve a deactivated or demoted user until the TTL runs out.
+USER_CACHE_TTL_SECONDS = 10.0
+_USER_CACHE_MAX_ENTRIES = 10_000
+_user_cache: dict[str, tuple[float, dict]] = {}
+
+
+@lru_cache(maxsize=4096)
+def _parse_user_id(uid: str) -> ObjectId | str:
+    """Parse a user id once; the same JWT subject recurs on every request."""
+    return ObjectId(uid) if ObjectId.is_valid(uid) else uid
+
+
+def _user_id_query(user_id: str | UUID) -> dict:
+    """Build the _id filter for a user id (ObjectId or legacy string)."""
+    return {"_id": _parse_user_id(str(user_id))}
+
+
 def get_users_collection() -> AsyncIOMotorCollection:
     """Get the users collection from MongoDB."""
     db = get_database()
@@ -26,14 +47,38 @@ async def get_user_by_email(email: str) -> Optional[dict]:
 async def get_user_by_id(user_id: str | UUID) -> Optional[dict]:
     """Get user by ID from MongoDB (uses _id)."""
     collection = get_users_collection()
-    uid = str(user_id)
-    # Try as ObjectId first, fall back to string match
-    if ObjectId.is_valid(uid):
-        doc = await collection.find_one({"_id": ObjectId(uid)})
-    else:
-        doc = await collection.find_one({"_id": uid})
+    doc = await collection.find_one(_user_id_query(user_id))
     return stringify_object_ids(doc) if doc else None
 
+async def get_user_by_id_cached(user_id: str | UUID) -> Optional[dict]:
+    """
+    Get user by ID, served from a short TTL cache when possible.
+
+    Used by the auth dependency, which resolves the same user on every request.
+    Only active users are cached, so an approval or reactivation takes effect
+    on the next request. Returns a shallow copy so callers can normalize fields freely.
+    """
+    key = str(user_id)
+    now = time.monotonic()
+    entry = _user_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return dict(entry[1])
+
+    user = await get_user_by_id(key)
+    if user is None or not user.get("is_active", False):
+        _user_cache.pop(key, None)
+        return user
+    if len(_user_cache) >= _USER_CACHE_MAX_ENTRIES:
+        _user_cache.clear()
+    _user_cache[key] = (now + USER_CACHE_TTL_SECONDS, user)
+    return dict(user)
+
+
+def invalidate_user(user_id: str | UUID) -> None:
+    """Drop a user from the auth lookup cache after it was modified."""
+    _user_cache.pop(str(user_id), None)
+
+
 async def create_user(user_data: dict) -> dict:
     """Create a new user in MongoDB."""
     collection = get_users_collection()
@@ -51,14 +96,13 @@ async def update_user_profile(user_id: str | UUID, update_data: dict) -> Optiona
     Uses $set so only provided fields are changed — existing fields are preserved.
     """
     collection = get_users_collection()
-    uid = str(user_id)
-    # Build query for _id
-    query = {"_id": ObjectId(uid)} if ObjectId.is_valid(uid) else {"_id": uid}
+    query = _user_id_query(user_id)
     result = await collection.find_one_and_update(
         query,
         {"$set": update_data},
         return_document=ReturnDocument.AFTER,
     )
+    invalidate_user(user_id)
     return stringify_object_ids(result) if result else None
 
 
@@ -84,9 +128,10 @@ async def list_all_users(
             {"email": {"$regex": pattern}},
         ]
 
-    cursor = collection.find(query).limit(limit)
-    docs = await cursor.to_list(length=limit)
-    return stringify_object_ids(docs)
+    # User documents carry no ObjectId besides _id, so the id mirror is
+    # computed by the server instead of walking every document here.
+    cursor = collection.aggregate([{"$match": query}, {"$limit": limit}, ID_AS_STRING_STAGE])
+    return await cursor.to_list(length=limit)
 
 
 async def set_user_active(user_id: str, is_active: bool) -> Optional[dict]:
@@ -94,13 +139,13 @@ async def set_user_active(user_id: str, is_active: bool) -> Optional[dict]:
     Admin: Activate or suspend a user by setting is_active.
     """
     collection = get_users_collection()
-    uid = str(user_id)
-    query = {"_id": ObjectId(uid)} if ObjectId.is_valid(uid) else {"_id": uid}
+    query = _user_id_query(user_id)
     result = await collection.find_one_and_update(
         query,
         {"$set": {"is_active": is_active}},
         return_document=ReturnDocument.AFTER,
     )
+    invalidate_user(user_id)
     return stringify_object_ids(result) if result else None
 
 
@@ -109,9 +154,9 @@ async def delete_user(user_id: str) -> bool:
     Delete a user record (used for cleanup on registration failure).
     """
     collection = get_users_collection()
-    uid = str(user_id)
-    query = {"_id": ObjectId(uid)} if ObjectId.is_valid(uid) else {"_id": uid}
+    query = _user_id_query(user_id)
     result = await collection.delete_one(query)
+    invalidate_user(user_id)
     return result.deleted_count > 0
 
 
@@ -122,20 +167,20 @@ async def change_password(user_id: str, current_password: str, new_password: str
     Raises ValueError on validation failure.
     """
     collection = get_users_collection()
-    uid = str(user_id)
-    query = {"_id": ObjectId(uid)} if ObjectId.is_valid(uid) else {"_id": uid}
+    query = _user_id_query(user_id)
 
     user = await collection.find_one(query)
     if user is None:
         raise ValueError("User not found")
 
-    if not verify_password(current_password, user["hashed_password"]):
+    if not await verify_password_async(current_password, user["hashed_password"]):
         raise ValueError("Current password is incorrect")
 
-    new_hashed = hash_password(new_password)
+    new_hashed = await hash_password_async(new_password)
     result = await collection.find_one_and_update(
         query,
         {"$set": {"hashed_password": new_hashed}},
         return_document=ReturnDocument.AFTER,
     )
+    invalidate_user(user_id)
     return stringify_object_ids(result)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Export the assistant's embedding model to INT8 ONNX for CPU inference.
+
+Writes model.onnx, model_int8.onnx and the tokenizer to
+backend/data/onnx/all-MiniLM-L6-v2/, where the vector store picks them up
+on CPU hosts with onnxruntime installed. Needs torch, transformers,
+onnx and onnxruntime; run once per deployment (or bake into the image).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModel, AutoTokenizer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_OUTPUT = os.path.join(BACKEND_DIR, "data", "onnx", "all-MiniLM-L6-v2")
+
+
+class _Encoder(torch.nn.Module):
+    """Positional-input wrapper, so tracing does not depend on forward()'s signature."""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(
+            input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+        ).last_hidden_state
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export the embedding model to INT8 ONNX.")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help=f"HuggingFace model id (default: {DEFAULT_MODEL})")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Output directory")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    os.makedirs(args.output, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModel.from_pretrained(args.model).eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(args.output, "model.onnx")
+    with torch.inference_mode():
+        torch.onnx.export(
+            _Encoder(model),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: dynamic for name in input_names + ["last_hidden_state"]},
+            opset_version=17,
+            dynamo=False,
+        )
+
+    int8_path = os.path.join(args.output, "model_int8.onnx")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(args.output)
+
+    print(f"Wrote {int8_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import os
 from dataclasses import dataclass
 
+# Settings are read when app modules are first imported (ENV defaults to prod,
+# which requires real secrets), so set test defaults before any test imports app
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
 import httpx
 import pytest
 
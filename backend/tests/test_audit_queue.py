@@ -0,0 +1,29 @@
+import asyncio
+
+from app.modules.audit import service as audit_service
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.batches.append(list(docs))
+
+
+def test_queued_audit_entries_are_batched_and_flushed_on_stop(monkeypatch):
+    collection = _FakeCollection()
+    monkeypatch.setattr(audit_service, "get_database", lambda: {"audit_logs": collection})
+
+    async def scenario():
+        audit_service.start_audit_writer()
+        for i in range(5):
+            await audit_service.queue_audit("admin", "event.force_start", "event", entity_id=str(i))
+        await audit_service.stop_audit_writer()
+
+    asyncio.run(scenario())
+
+    written = [doc["entity_id"] for batch in collection.batches for doc in batch]
+    assert written == ["0", "1", "2", "3", "4"]
+    assert len(collection.batches) <= 2
+    assert audit_service._audit_queue is None
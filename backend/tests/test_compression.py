@@ -0,0 +1,37 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+@app.get("/big")
+def big():
+    return PlainTextResponse("x" * 4096)
+
+
+@app.get("/sse")
+def sse():
+    async def frames():
+        for _ in range(100):
+            yield b'data: {"text": "chunk"}\n\n'
+
+    return StreamingResponse(frames(), media_type="text/event-stream")
+
+
+client = TestClient(app)
+
+
+def test_large_response_is_gzipped():
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "x" * 4096
+
+
+def test_event_stream_is_not_gzipped():
+    response = client.get("/sse", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text.count("data: ") == 100
@@ -0,0 +1,35 @@
+import os
+
+from app.core import config
+
+
+def test_env_file_is_read_privately(monkeypatch, tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("DATABASE_NAME=from_file\nSTRIPE_SECRET_KEY=sk_file\nUNDECLARED_TOKEN=zzz\n")
+    monkeypatch.setattr(config, "ENV_FILE", str(env_file))
+    monkeypatch.setenv("MONGO_URI", "mongodb://env-wins")
+    monkeypatch.delenv("STRIPE_SECRET_KEY", raising=False)
+    monkeypatch.setattr(config, "_settings_cache", None)
+    settings = config.get_settings()
+
+    assert settings.DATABASE_NAME == "from_file"
+    assert settings.STRIPE_SECRET_KEY == "sk_file"
+    assert settings.MONGO_URI == "mongodb://env-wins"
+    # Nothing from the file is exported to child processes
+    assert "STRIPE_SECRET_KEY" not in os.environ and "UNDECLARED_TOKEN" not in os.environ
+
+
+def test_dev_settings_follow_env_file_edits(monkeypatch, tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("DATABASE_NAME=first\n")
+    monkeypatch.setattr(config, "ENV_FILE", str(env_file))
+    monkeypatch.setenv("ENV", "dev")
+    monkeypatch.delenv("DATABASE_NAME", raising=False)
+    monkeypatch.setattr(config, "_settings_cache", None)
+
+    first = config.get_settings()
+    assert config.get_settings() is first
+
+    env_file.write_text("DATABASE_NAME=second\n")
+    os.utime(env_file, (0, os.stat(env_file).st_mtime + 5))
+    assert config.get_settings().DATABASE_NAME == "second"
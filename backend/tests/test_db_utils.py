@@ -0,0 +1,27 @@
+from bson import ObjectId
+
+from app.db.utils import stringify_object_ids
+
+
+def test_stringify_object_ids_nested():
+    oid, ref = ObjectId(), ObjectId()
+    doc = {
+        "_id": oid,
+        "id": "stale-uuid",
+        "owner_id": ref,
+        "members": [ref, {"_id": ref}],
+        "meta": {"tags": ["a"], "n": 1},
+    }
+    out = stringify_object_ids(doc)
+    assert out is doc
+    assert out["_id"] == out["id"] == str(oid)
+    assert out["owner_id"] == str(ref)
+    assert out["members"] == [str(ref), {"_id": str(ref), "id": str(ref)}]
+    assert out["meta"] == {"tags": ["a"], "n": 1}
+
+
+def test_stringify_object_ids_scalars_and_lists():
+    oid = ObjectId()
+    assert stringify_object_ids(oid) == str(oid)
+    assert stringify_object_ids(None) is None
+    assert stringify_object_ids([{"_id": oid}]) == [{"_id": str(oid), "id": str(oid)}]
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import zlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+
+from app.modules.ai_rag import vector_store as vs
+
+
+class _FakeEncoder:
+    """Deterministic unit vectors per text; records what reaches the model."""
+
+    def __init__(self, release=None):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = release
+
+    @staticmethod
+    def vector(text):
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        v = rng.standard_normal(8).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        return np.stack([self.vector(t) for t in texts])
+
+
+@pytest.fixture
+def encoder(monkeypatch, tmp_path):
+    fake = _FakeEncoder()
+    monkeypatch.setattr(vs, "get_embedding_model", lambda: fake)
+    monkeypatch.setattr(vs, "EMBEDDING_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(vs, "_embed_memo", {})
+    monkeypatch.setattr(vs, "_embed_loop", None)
+    monkeypatch.setattr(vs, "_embed_queue", None)
+    monkeypatch.setattr(vs, "_embed_task", None)
+    vs._embedding_cache_db.cache_clear()
+    yield fake
+    vs._embedding_cache_db.cache_clear()
+
+
+def test_concurrent_callers_share_one_encode_and_get_their_own_vectors(encoder):
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                vs.embed_texts(["alpha", "beta"]),
+                vs.embed_texts(["gamma"]),
+                vs.embed_texts(["delta", "alpha"]),
+            )
+        finally:
+            await vs.stop_embedding_worker()
+
+    results = asyncio.run(scenario())
+
+    assert len(encoder.calls) == 1
+    assert sorted(encoder.calls[0]) == ["alpha", "beta", "delta", "gamma"]
+    for texts, vectors in zip([["alpha", "beta"], ["gamma"], ["delta", "alpha"]], results):
+        assert len(vectors) == len(texts)
+        for text, vector in zip(texts, vectors):
+            assert vector == pytest.approx(encoder.vector(text).tolist(), abs=1e-6)
+
+
+def test_cached_texts_skip_the_worker_and_a_new_loop_gets_its_own(encoder):
+    asyncio.run(vs.embed_texts(["alpha"]))  # loop closed without stopping the worker
+
+    async def repeat():
+        return await vs.embed_texts(["alpha", "beta"])
+
+    assert len(asyncio.run(repeat())) == 2
+    assert encoder.calls == [["alpha"], ["beta"]]  # only the miss was queued
+
+    task = vs._embed_task
+    asyncio.run(repeat())
+    assert vs._embed_task is task and encoder.calls[2:] == []  # all hits: no worker needed
+
+
+def test_stop_cancels_in_flight_and_queued_callers(encoder):
+    encoder.release = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(vs.embed_texts(["first"]))
+        while not encoder.started.is_set():
+            await asyncio.sleep(0.01)
+        queued = asyncio.create_task(vs.embed_texts(["second"]))
+        await asyncio.sleep(0.01)
+
+        await vs.stop_embedding_worker()
+        encoder.release.set()
+        for task in (running, queued):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(scenario())
+    assert encoder.calls == [["first"]]
+
+
+def test_encode_texts_serves_hits_from_sqlite_and_encodes_only_misses(encoder, monkeypatch):
+    first = vs.encode_texts(["Known", "other"])
+    assert encoder.calls == [["Known", "other"]]
+
+    # A new process: the in-memory memo is empty, the SQLite table is not
+    monkeypatch.setattr(vs, "_embed_memo", {})
+    second = vs.encode_texts([" known ", "new", "new"])
+
+    assert encoder.calls[1:] == [["new"]]
+    assert second[0] == pytest.approx(first[0], abs=1e-3)  # float16 round trip
+    assert second[1] == second[2]
+    assert second[1] == pytest.approx(encoder.vector("new").tolist(), abs=1e-6)
+
+
+def test_query_cache_reuses_results_only_above_threshold():
+    cache = vs._QueryCache(size=4)
+    hit = vs.SearchHit("c1", "doc", {}, 0.1)
+    base = [1.0, 0.0, 0.0]
+    cache.put(base, ("scope", 5), [hit])
+
+    def rotated(cosine):
+        return [cosine, float(np.sqrt(1 - cosine ** 2)), 0.0]
+
+    assert cache.get(rotated(vs.QUERY_CACHE_THRESHOLD + 0.01), ("scope", 5)) == [hit]
+    assert cache.get(rotated(vs.QUERY_CACHE_THRESHOLD - 0.01), ("scope", 5)) is None
+    assert cache.get(base, ("other", 5)) is None
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("faiss")
+
+from app.modules.ai_rag import faiss_store
+
+DIM = 384
+
+
+class _EmptyChroma:
+    def get_collection(self, name):
+        raise ValueError(name)
+
+
+@pytest.fixture
+def store_factory(monkeypatch, tmp_path):
+    monkeypatch.setattr(faiss_store, "FAISS_PERSIST_DIR", str(tmp_path))
+    monkeypatch.setattr(faiss_store, "get_chroma_client", lambda: _EmptyChroma())
+    return lambda: faiss_store.FaissVectorStore(collection_name="ivep_test")
+
+
+def _vectors(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal((n, DIM)).astype(np.float32)
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).tolist()
+
+
+def test_add_search_delete_roundtrip(store_factory):
+    store = store_factory()
+    vecs = _vectors(3)
+    store.add_documents(["a", "b", "c"], [{"k": 0}, {"k": 1}, {"k": 2}], ids=["A", "B", "C"], embeddings=vecs)
+
+    hits = store.search("", top_k=2, query_embedding=vecs[1])
+    assert [h.id for h in hits][0] == "B"
+    assert hits[0].document == "b" and hits[0].metadata == {"k": 1}
+    assert hits[0].distance == pytest.approx(0.0, abs=1e-5)
+
+    store.delete(["B"])
+    assert "B" not in [h.id for h in store.search("", top_k=3, query_embedding=vecs[1])]
+    assert store.get_collection_stats()["count"] == 2
+
+    # Persisted: a fresh instance reopens the same index and rows
+    assert [h.id for h in store_factory().search("", top_k=1, query_embedding=vecs[0])] == ["A"]
+
+
+def test_filtered_search_returns_top_k_even_when_matches_rank_low(store_factory):
+    store = store_factory()
+    vecs = _vectors(60)
+    metas = [{"scope": "rare" if i >= 55 else "common"} for i in range(60)]
+    store.add_documents([f"d{i}" for i in range(60)], metas, ids=[str(i) for i in range(60)], embeddings=vecs)
+
+    # Query right on a common vector: the 5 rare chunks are far outside top_k * 4
+    hits = store.search("", top_k=5, filter_metadata={"scope": "rare"}, query_embedding=vecs[0])
+    assert sorted(h.id for h in hits) == [str(i) for i in range(55, 60)]
+
+
+def test_index_upgrades_to_ivfpq_and_still_deletes(store_factory, monkeypatch):
+    monkeypatch.setattr(faiss_store, "IVFPQ_MIN_VECTORS", 300)
+    store = store_factory()
+    vecs = _vectors(320, seed=1)
+    ids = [f"c{i}" for i in range(320)]
+    store.add_documents([f"doc {i}" for i in range(320)], [{} for _ in ids], ids=ids, embeddings=vecs)
+
+    assert store._is_ivf()
+    assert store.get_collection_stats()["count"] == 320
+    assert "c7" in [h.id for h in store.search("", top_k=5, query_embedding=vecs[7])]
+
+    store.delete(["c7"])
+    assert store.get_collection_stats()["count"] == 319
+    assert "c7" not in [h.id for h in store.search("", top_k=5, query_embedding=vecs[7])]
+    # The upgraded index is what gets reopened
+    assert store_factory()._is_ivf()
@@ -0,0 +1,30 @@
+from app.db.indexes import INDEX_SPECS, OBSOLETE_INDEXES
+
+
+def _key_list(keys):
+    return [(keys, 1)] if isinstance(keys, str) else list(keys)
+
+
+def test_no_index_is_a_prefix_of_another():
+    """A plain index whose keys lead a compound index on the same collection is dead weight."""
+    specs = [(collection, _key_list(keys), options) for collection, keys, options in INDEX_SPECS]
+    redundant = [
+        (collection, keys)
+        for collection, keys, options in specs
+        if not options
+        and any(
+            other_collection == collection
+            and len(other) > len(keys)
+            and other[: len(keys)] == keys
+            for other_collection, other, _ in specs
+        )
+    ]
+    assert redundant == []
+
+
+def test_obsolete_indexes_are_not_recreated():
+    created = {
+        (collection, options.get("name") or "_".join(f"{field}_{direction}" for field, direction in _key_list(keys)))
+        for collection, keys, options in INDEX_SPECS
+    }
+    assert created.isdisjoint(OBSOLETE_INDEXES)
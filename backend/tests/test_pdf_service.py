@@ -0,0 +1,131 @@
+import asyncio
+import re
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pdf_module = pytest.importorskip("app.modules.analytics.pdf_service")
+from app.modules.analytics import pdf_pool
+
+_REPORT_DATA = {
+    "report_title": "Platform",
+    "kpis": [{"label": "Total Users", "value": 3}],
+    "revenue": {"ticket_revenue": 1, "stand_revenue": 2, "total_revenue": 3},
+    "safety": {"total_flags": 1, "resolved_flags": 1, "resolution_rate": 1},
+}
+
+
+def test_report_pdf_cache_hits_across_fresh_timestamps(monkeypatch):
+    pdf_module._pdf_cache.clear()
+    compiled = []
+
+    def fake_compile(html):
+        compiled.append(html)
+        return b"%PDF-" + str(len(compiled)).encode()
+
+    service = pdf_module.PDFService(pdf_module.pdf_service.templates_dir)
+    monkeypatch.setattr(service, "compile_pdf", fake_compile)
+
+    # Every export stamps its own generated_at, as the routers do
+    first = service.generate_report_pdf(
+        {**_REPORT_DATA, "generated_at": "2024-01-01T00:00:00.123456+00:00"}, template_name="admin_platform_report"
+    )
+    repeat = {**_REPORT_DATA, "generated_at": "2024-01-01T00:00:01.654321+00:00"}
+    again = service.generate_report_pdf(repeat, template_name="admin_platform_report")
+    changed = service.generate_report_pdf(
+        {**_REPORT_DATA, "report_title": "Changed", "generated_at": "2024-01-01T00:00:02+00:00"},
+        template_name="admin_platform_report",
+    )
+
+    assert first == again == b"%PDF-1"
+    # The hit reports the build time the cached PDF prints
+    assert repeat["generated_at"] == "2024-01-01T00:00:00.123456+00:00"
+    assert changed == b"%PDF-2"
+    assert "2024-01-01T00:00:02+00:00" in compiled[-1]
+
+
+def test_report_pdf_without_timestamp_is_stamped_now(monkeypatch):
+    pdf_module._pdf_cache.clear()
+    compiled = []
+    service = pdf_module.PDFService(pdf_module.pdf_service.templates_dir)
+    monkeypatch.setattr(service, "compile_pdf", lambda html: compiled.append(html) or b"%PDF-")
+
+    before = pdf_module.datetime.now(pdf_module.timezone.utc).replace(microsecond=0)
+    service.generate_report_pdf(dict(_REPORT_DATA), template_name="admin_platform_report")
+    after = pdf_module.datetime.now(pdf_module.timezone.utc)
+
+    printed = re.search(r"Generated \(UTC\):</strong> ([^<\n]+)", compiled[0]).group(1).strip()
+    stamped = pdf_module.datetime.strptime(printed, "%Y-%m-%d %H:%M:%S UTC").replace(tzinfo=pdf_module.timezone.utc)
+    assert before <= stamped <= after
+
+
+def test_async_export_returns_the_same_pdf(monkeypatch):
+    pdf_module._pdf_cache.clear()
+    # Single-worker path: compiled on a thread, where the patched method applies
+    monkeypatch.setattr(pdf_pool, "PDF_COMPILE_WORKERS", 1)
+    service = pdf_module.PDFService(pdf_module.pdf_service.templates_dir)
+    monkeypatch.setattr(service, "compile_pdf", lambda html: b"%PDF-async")
+
+    pdf = asyncio.run(service.generate_report_pdf_async({"report_title": "Async"}, template_name="report"))
+    assert pdf == b"%PDF-async"
+
+
+def test_async_export_compiles_in_the_process_pool(monkeypatch):
+    pdf_module._pdf_cache.clear()
+    monkeypatch.setattr(pdf_pool, "PDF_COMPILE_WORKERS", 2)
+    service = pdf_module.PDFService(pdf_module.pdf_service.templates_dir)
+    # Must not be called: the pool workers compile with the module-level function
+    monkeypatch.setattr(service, "compile_pdf", lambda html: b"in-process")
+
+    async def export_twice():
+        return await asyncio.gather(
+            service.generate_report_pdf_async(dict(_REPORT_DATA), template_name="admin_platform_report"),
+            service.generate_report_pdf_async({**_REPORT_DATA, "report_title": "Other"}, template_name="admin_platform_report"),
+        )
+
+    try:
+        pdfs = asyncio.run(export_twice())
+        assert pdf_pool._pdf_pool is not None
+    finally:
+        pdf_pool.shutdown_pdf_pool()
+
+    assert all(pdf.startswith(b"%PDF-") for pdf in pdfs)
+    assert pdf_pool._pdf_pool is None
+
+
+def test_broken_pool_is_replaced_and_the_export_still_succeeds(monkeypatch):
+    pdf_module._pdf_cache.clear()
+
+    class _BrokenPool:
+        shut_down = False
+
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    broken = _BrokenPool()
+    monkeypatch.setattr(pdf_pool, "_pdf_pool", broken)
+    monkeypatch.setattr(pdf_pool, "PDF_COMPILE_WORKERS", 2)
+    service = pdf_module.PDFService(pdf_module.pdf_service.templates_dir)
+    monkeypatch.setattr(service, "compile_pdf", lambda html: b"%PDF-thread")
+
+    pdf = asyncio.run(service.generate_report_pdf_async(dict(_REPORT_DATA), template_name="admin_platform_report"))
+
+    assert pdf == b"%PDF-thread"
+    assert broken.shut_down and pdf_pool._pdf_pool is None
+
+
+def test_unwritable_bytecode_dir_disables_the_cache(monkeypatch, tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(pdf_module, "JINJA_BYTECODE_DIR", str(blocker / "jinja_cache"))
+
+    service = pdf_module.PDFService(pdf_module.pdf_service.templates_dir)
+
+    assert service.jinja_env.bytecode_cache is None
+    assert "Platform" in service.generate_html(dict(_REPORT_DATA), template_name="admin_platform_report")
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from app.modules.ai_rag import service as rag_module
+from app.modules.ai_rag.vector_store import SearchHit
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self._docs:
+            yield doc
+
+
+class _Documents:
+    def __init__(self):
+        self.rows = {}
+
+    async def insert_one(self, doc):
+        self.rows[doc["_id"]] = dict(doc)
+
+    def _matching(self, query):
+        return [
+            i for i in query["_id"]["$in"]
+            if i in self.rows and self.rows[i]["scope"] == query.get("scope", self.rows[i]["scope"])
+        ]
+
+    def find(self, query, projection=None):
+        return _Cursor([dict(self.rows[i]) for i in self._matching(query)])
+
+    async def delete_many(self, query):
+        for i in self._matching(query):
+            self.rows.pop(i)
+
+
+class _DB:
+    def __init__(self):
+        self.assistant_documents = _Documents()
+
+
+class _Store:
+    def __init__(self, fail=False):
+        self.chunks = {}
+        self.fail = fail
+
+    def add_documents(self, documents, metadatas, ids, embeddings):
+        if self.fail:
+            raise RuntimeError("vector store down")
+        for i, doc, meta in zip(ids, documents, metadatas):
+            self.chunks[i] = SearchHit(i, doc, meta, 0.1)
+        return ids
+
+    def search(self, query, top_k=5, query_embedding=None):
+        return list(self.chunks.values())[:top_k]
+
+    def delete(self, ids):
+        for i in ids:
+            self.chunks.pop(i, None)
+
+
+@pytest.fixture
+def rag(monkeypatch):
+    db, store = _DB(), _Store()
+    rag_module._doc_headers.clear()
+    monkeypatch.setattr(rag_module, "get_database", lambda: db)
+    monkeypatch.setattr(rag_module, "embed_texts", _fake_embed)
+    service = rag_module.RAGService()
+    monkeypatch.setattr(service, "get_vector_store", lambda scope="platform": store)
+    return service, db, store
+
+
+async def _fake_embed(texts):
+    return [[1.0, 0.0] for _ in texts]
+
+
+def test_ingest_header_is_hydrated_into_search_hits(rag):
+    service, db, store = rag
+    # Caller metadata must not redirect or overwrite the fields ingest owns
+    result = asyncio.run(service.ingest_document(
+        "Booth A sells solar panels.", scope="platform", source="brochure.pdf",
+        _id="hijack", created_at="never", total_chunks=0, owner="acme",
+    ))
+
+    header = db.assistant_documents.rows[result["doc_id"]]
+    assert header["source"] == "brochure.pdf" and header["owner"] == "acme"
+    assert header["created_at"] != "never"
+    assert header["total_chunks"] == result["chunks_created"]
+    assert "hijack" not in db.assistant_documents.rows
+
+    hits = asyncio.run(service._search("solar", "platform", top_k=3))
+    assert hits and hits[0].source == "brochure.pdf"
+    assert hits[0].metadata["doc_id"] == result["doc_id"]
+
+
+def test_failed_vector_write_leaves_no_header(rag, monkeypatch):
+    service, db, _ = rag
+    monkeypatch.setattr(service, "get_vector_store", lambda scope="platform": _Store(fail=True))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.ingest_document("Some text.", source="doc.txt"))
+    assert db.assistant_documents.rows == {}
+
+
+def test_delete_by_doc_id_removes_chunks_and_header(rag):
+    service, db, store = rag
+    doc = asyncio.run(service.ingest_document("First document text.", source="a.txt"))
+    keep = asyncio.run(service.ingest_document("Second document text.", source="b.txt"))
+
+    asyncio.run(service.delete_documents("platform", [doc["doc_id"]]))
+    assert not any(i.startswith(doc["doc_id"]) for i in store.chunks)
+    assert doc["doc_id"] not in db.assistant_documents.rows
+
+    # Deleting every chunk by id drops the header too
+    asyncio.run(service.delete_documents("platform", keep["chunk_ids"]))
+    assert store.chunks == {}
+    assert db.assistant_documents.rows == {}
+
+
+def test_delete_only_touches_headers_in_its_scope(rag):
+    service, db, store = rag
+    doc = asyncio.run(service.ingest_document("Event brochure.", scope="event-1", source="e.txt"))
+
+    asyncio.run(service.delete_documents("platform", [doc["doc_id"]]))
+    assert db.assistant_documents.rows[doc["doc_id"]]["source"] == "e.txt"
+
+    asyncio.run(service.delete_documents("event-1", [doc["doc_id"]]))
+    assert db.assistant_documents.rows == {}
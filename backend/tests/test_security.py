@@ -0,0 +1,76 @@
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.dependencies import verify_jwt_token
+from app.core.security import (
+    _verify_hs256,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_password_hash,
+    verify_password,
+    verify_token_type,
+)
+
+SECRET = os.environ["JWT_SECRET_KEY"]
+
+
+def test_access_token_roundtrip():
+    token = create_access_token(data={"sub": "user-1", "role": "visitor"})
+    payload = decode_token(token)
+    assert payload["sub"] == "user-1"
+    assert payload["type"] == "access"
+    assert verify_token_type(token, "refresh") is None
+
+
+def test_decoded_payload_is_not_shared():
+    token = create_refresh_token({"sub": "user-2"})
+    decode_token(token)["sub"] = "tampered"
+    assert decode_token(token)["sub"] == "user-2"
+
+
+def test_expired_token_rejected():
+    token = create_access_token(subject="user-3", expires_delta=timedelta(seconds=-1))
+    assert decode_token(token) is None
+
+
+def test_fast_path_matches_jose():
+    token = jwt.encode({"sub": "user-4", "exp": int(time.time()) + 60}, SECRET, algorithm="HS256")
+    assert _verify_hs256(token, SECRET.encode()) == jwt.decode(token, SECRET, algorithms=["HS256"])
+
+
+def test_fast_path_rejects_bad_tokens():
+    key = SECRET.encode()
+    good = jwt.encode({"sub": "user-5"}, SECRET, algorithm="HS256")
+    assert _verify_hs256(good, b"other-secret") is None
+    assert _verify_hs256(jwt.encode({"sub": "x"}, SECRET, algorithm="HS512"), key) is None
+    assert _verify_hs256(jwt.encode({"sub": "x", "nbf": time.time() + 60}, SECRET), key) is None
+    assert _verify_hs256(jwt.encode({"sub": "x", "aud": "other"}, SECRET), key) is None
+    assert _verify_hs256("not.a-token", key) is None
+    assert _verify_hs256("###.###.###", key) is None
+
+
+def test_verify_password_rejects_malformed_hashes():
+    hashed = get_password_hash("s3cret")
+    assert verify_password("s3cret", hashed)
+    assert not verify_password("wrong", hashed)
+    assert not verify_password("s3cret", "plaintext")
+    assert not verify_password("s3cret", "$2b$12$tooshort")
+    assert not verify_password("s3cret", None)
+
+
+def test_rejected_tokens_raise_fresh_exceptions():
+    raised = []
+    for _ in range(2):
+        try:
+            asyncio.run(verify_jwt_token("not-a-token"))
+        except HTTPException as exc:
+            raised.append(exc)
+    assert [exc.status_code for exc in raised] == [401, 401]
+    # A shared instance would carry every earlier raise in its __traceback__
+    assert raised[0] is not raised[1]
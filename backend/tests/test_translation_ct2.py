@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("transformers")
+
+from app.modules.ai_translation import translation_model as tm
+
+
+def test_concurrent_first_requests_convert_the_model_once(monkeypatch, tmp_path):
+    conversions = []
+
+    class _Converter:
+        def __init__(self, model_name):
+            self.model_name = model_name
+
+        def convert(self, output_dir, force=False):
+            conversions.append(self.model_name)
+            time.sleep(0.05)  # wide enough for a second caller to race in
+            os.makedirs(output_dir)
+
+    fake_ct2 = SimpleNamespace(
+        converters=SimpleNamespace(TransformersConverter=_Converter),
+        Translator=lambda path, device, compute_type: SimpleNamespace(path=path),
+    )
+    monkeypatch.setattr(tm, "ctranslate2", fake_ct2)
+    monkeypatch.setattr(tm, "CT2_MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        tm.GenerationConfig, "from_pretrained", classmethod(lambda cls, name: SimpleNamespace(num_beams=4))
+    )
+
+    translator = tm.MarianTranslator(device="cpu")
+    start = threading.Barrier(4)
+
+    def load(_):
+        start.wait()
+        return translator._load_ct2("Helsinki-NLP/opus-mt-en-fr")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        loaded = list(pool.map(load, range(4)))
+
+    assert conversions == ["Helsinki-NLP/opus-mt-en-fr"]
+    assert all(t is loaded[0] for t in loaded) and loaded[0] is not None
+    assert translator._ct2_beams["Helsinki-NLP/opus-mt-en-fr"] == 4
+    assert os.listdir(tmp_path) == ["Helsinki-NLP--opus-mt-en-fr"]
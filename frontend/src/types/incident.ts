@@ -45,6 +45,7 @@ export interface PlatformHealth {
     uptime_seconds: number;
     services: {
         mongodb: { status: string; latency_ms: number | null };
+        indexes?: { status: string };
         redis: { status: string; latency_ms: number | null };
         api: { status: string; pid: number };
     };